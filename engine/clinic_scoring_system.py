@@ -381,7 +381,7 @@ def main():
         # Parse establishment IDs if provided
         establishment_ids = None
         if args.establishments:
-            establishment_ids = [id.strip() for id in args.establishments.split(',')]
+            establishment_ids = list(map(str.strip, args.establishments.split(',')))
         
         # Process establishments
         results = scorer.process_all_establishments(establishment_ids)
@@ -1,13 +1,43 @@
 # database/db_manager.py
 import os
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
+from pymongo import MongoClient, InsertOne
+from pymongo.errors import ConnectionFailure, BulkWriteError
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Iterable, Iterator, Tuple
+from itertools import chain, islice
 import logging
 from bson import ObjectId
-import langdetect
 import hashlib
+import xxhash
+from pybloom_live import ScalableBloomFilter
+
+# fastText language identification model (https://fasttext.cc/docs/en/language-identification.html),
+# resolved relative to the engine package unless LANG_MODEL_PATH is set
+LANG_MODEL_PATH = os.environ.get(
+    'LANG_MODEL_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models', 'lid.176.bin')
+)
+
+# Number of scraped reviews buffered per unordered bulk write
+REVIEW_WRITE_BATCH_SIZE = 2000
+
+# Establishment fields the scrapers read back from lookups
+ESTABLISHMENT_PROJECTION = {"_id": 1, "display_name": 1, "google_url": 1, "website": 1}
+
+# Unified review fields needed to estimate translation work
+TRANSLATION_COUNT_PROJECTION = {
+    "_id": 1, "platform": 1, "title": 1, "review_text": 1,
+    "review_language": 1, "response_from_owner_text": 1
+}
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield successive lists of up to size items from any iterable"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
 
 class DatabaseManager:
     def __init__(self):
@@ -15,6 +45,9 @@ class DatabaseManager:
         self.db = None
         self.logger = self._setup_logging()
         self.translation_cache = {}  # In-memory cache for duplicate texts
+        self.language_cache = {}  # Detected languages keyed by text hash
+        self.lang_model = None  # Loaded on first language detection
+        self.lang_model_failed = False  # Set once fastText is unavailable, so we fall back to langdetect
         
     def _setup_logging(self):
         logging.basicConfig(level=logging.INFO)
@@ -35,13 +68,33 @@ class DatabaseManager:
             self.logger.error(f"Failed to connect to MongoDB: {e}")
             return False
     
-    def get_establishment_by_url(self, google_url: str) -> Optional[Dict]:
-        """Check if establishment already exists by Google URL"""
-        return self.db.establishments.find_one({"google_url": google_url})
+    def get_establishment_by_url(self, google_url: str,
+                                 projection: Optional[Dict] = ESTABLISHMENT_PROJECTION) -> Optional[Dict]:
+        """Check if establishment already exists by Google URL (pass projection=None for the full document)"""
+        return self.db.establishments.find_one({"google_url": google_url}, projection)
     
-    def create_establishment(self, display_name: str, google_url: str, website: str) -> str:
-        """Create new establishment record"""
-        establishment = {
+    def get_establishments_by_urls(self, google_urls: List[str],
+                                   projection: Optional[Dict] = ESTABLISHMENT_PROJECTION) -> Dict[str, Dict]:
+        """Get existing establishments for many Google URLs in one query, keyed by Google URL"""
+        cursor = self.db.establishments.find(
+            {"google_url": {"$in": google_urls}},
+            projection
+        )
+        return {establishment["google_url"]: establishment for establishment in cursor}
+    
+    def create_establishments_indexes(self):
+        """Create indexes on establishments collection for URL lookups"""
+        try:
+            # Unique so batched $in lookups are index scans and duplicates cannot slip in
+            self.db.establishments.create_index("google_url", unique=True)
+            
+            self.logger.info("Created indexes on establishments collection")
+        except Exception as e:
+            self.logger.error(f"Error creating indexes: {e}")
+    
+    def _build_establishment(self, display_name: str, google_url: str, website: str) -> Dict:
+        """Build a new establishment document"""
+        return {
             "display_name": display_name,
             "google_url": google_url,
             "website": website,
@@ -53,21 +106,51 @@ class DatabaseManager:
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
+    
+    def create_establishment(self, display_name: str, google_url: str, website: str) -> str:
+        """Create new establishment record"""
+        establishment = self._build_establishment(display_name, google_url, website)
         
         result = self.db.establishments.insert_one(establishment)
         self.logger.info(f"Created establishment: {display_name}")
         return str(result.inserted_id)
     
+    def create_establishments(self, establishments: List[Dict]) -> List[str]:
+        """
+        Create many establishment records in a single insert_many round trip
+        
+        Args:
+            establishments: Dicts with display_name, google_url and website keys
+        
+        Returns:
+            Created establishment IDs, in the same order as the input
+        """
+        if not establishments:
+            return []
+        
+        documents = [
+            self._build_establishment(est['display_name'], est['google_url'], est['website'])
+            for est in establishments
+        ]
+        
+        result = self.db.establishments.insert_many(documents, ordered=False)
+        self.logger.info(f"Created {len(result.inserted_ids)} establishments")
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+    
     def update_establishment_scrape_info(self, establishment_id: str, platform: str, total_reviews: int):
         """Update last scraped timestamp and review count"""
-        update_data = {
-            f"{platform}_last_scraped": datetime.utcnow(),
-            f"{platform}_total_reviews": total_reviews,
-            "updated_at": datetime.utcnow()
-        }
+        self.update_establishment_scrape_infos(establishment_id, {platform: total_reviews})
+    
+    def update_establishment_scrape_infos(self, establishment_id: str, platform_counts: Dict[str, int]):
+        """Update last scraped timestamps and review counts for several platforms in one write"""
+        now = datetime.utcnow()
+        update_data = {"updated_at": now}
+        for platform, total_reviews in platform_counts.items():
+            update_data[f"{platform}_last_scraped"] = now
+            update_data[f"{platform}_total_reviews"] = total_reviews
         
         self.db.establishments.update_one(
-            {"_id": establishment_id},
+            {"_id": ObjectId(establishment_id)},
             {"$set": update_data}
         )
     
@@ -75,29 +158,49 @@ class DatabaseManager:
         """Save Google reviews to database"""
         if not reviews:
             return 0
-            
-        for review in reviews:
-            review["establishment_id"] = establishment_id
-            review["platform"] = "google"
-            review["scraped_at"] = datetime.utcnow()
-        
-        result = self.db.google.insert_many(reviews)
-        self.logger.info(f"Saved {len(reviews)} Google reviews for establishment {establishment_id}")
-        return len(result.inserted_ids)
+        return self._save_reviews_stream(self.db.google, "google", "Google", establishment_id, reviews)
     
     def save_trustpilot_reviews(self, establishment_id: str, reviews: List[Dict]):
         """Save Trustpilot reviews to database"""
         if not reviews:
             return 0
-            
-        for review in reviews:
-            review["establishment_id"] = establishment_id
-            review["platform"] = "trustpilot"
-            review["scraped_at"] = datetime.utcnow()
-        
-        result = self.db.trustpilot.insert_many(reviews)
-        self.logger.info(f"Saved {len(reviews)} Trustpilot reviews for establishment {establishment_id}")
-        return len(result.inserted_ids)
+        return self._save_reviews_stream(self.db.trustpilot, "trustpilot", "Trustpilot", establishment_id, reviews)
+    
+    def save_google_reviews_stream(self, establishment_id: str, reviews: Iterable[Dict]) -> int:
+        """Save Google reviews to database as they are scraped"""
+        return self._save_reviews_stream(self.db.google, "google", "Google", establishment_id, reviews)
+    
+    def save_trustpilot_reviews_stream(self, establishment_id: str, reviews: Iterable[Dict]) -> int:
+        """Save Trustpilot reviews to database as they are scraped"""
+        return self._save_reviews_stream(self.db.trustpilot, "trustpilot", "Trustpilot", establishment_id, reviews)
+    
+    def _save_reviews_stream(self, collection, platform: str, platform_label: str,
+                             establishment_id: str, reviews: Iterable[Dict]) -> int:
+        """Consume a review iterable, writing fixed-size unordered insert_many batches"""
+        def tagged_reviews():
+            for review in reviews:
+                review["establishment_id"] = establishment_id
+                review["platform"] = platform
+                review["scraped_at"] = datetime.utcnow()
+                yield review
+        
+        saved_count = 0
+        for chunk in _chunks(tagged_reviews(), REVIEW_WRITE_BATCH_SIZE):
+            saved_count += self._insert_review_chunk(collection, chunk)
+        
+        self.logger.info(f"Saved {saved_count} {platform_label} reviews for establishment {establishment_id}")
+        return saved_count
+    
+    def _insert_review_chunk(self, collection, reviews: List[Dict]) -> int:
+        """Insert one batch of reviews, counting rejected documents instead of aborting"""
+        try:
+            return len(collection.insert_many(reviews, ordered=False).inserted_ids)
+        except BulkWriteError as e:
+            write_errors = e.details.get('writeErrors', [])
+            duplicates = sum(1 for error in write_errors if error.get('code') == 11000)
+            self.logger.warning(f"Skipped {len(write_errors)} reviews in batch "
+                              f"({duplicates} duplicates): {str(write_errors[:1])[:200]}")
+            return e.details.get('nInserted', 0)
     
     def get_establishments_to_scrape(self) -> List[Dict]:
         """Get all establishments that need scraping"""
@@ -105,90 +208,96 @@ class DatabaseManager:
     
     def _standardize_google_review(self, review: Dict) -> Dict:
         """Standardize Google review to unified format"""
+        # Bind the hot lookups once; this runs for every review being unified
+        get = review.get
+        now = datetime.utcnow()
         return {
             "_id": review["_id"],  # Use original MongoDB ObjectId as unified review ID
-            "original_review_id": review.get('review_id'),
-            "establishment_id": review.get('establishment_id'),
+            "original_review_id": get('review_id'),
+            "establishment_id": get('establishment_id'),
             "platform": "google",
-            "author_name": review.get('name'),
-            "author_id": review.get('reviewerId'),
-            "author_url": review.get('reviewerUrl'),
-            "author_photo_url": review.get('reviewerPhotoUrl'),
-            "author_review_count": review.get('reviewerNumberOfReviews'),
-            "is_local_guide": review.get('isLocalGuide', False),
-            "rating": review.get('rating') or review.get('stars'),
+            "author_name": get('name'),
+            "author_id": get('reviewerId'),
+            "author_url": get('reviewerUrl'),
+            "author_photo_url": get('reviewerPhotoUrl'),
+            "author_review_count": get('reviewerNumberOfReviews'),
+            "is_local_guide": get('isLocalGuide', False),
+            "rating": get('rating') or get('stars'),
             "title": None,  # Google reviews don't have titles
-            "review_text": review.get('text', ''),
-            "review_text_translated": review.get('textTranslated'),
-            "review_date": review.get('publishedAtDate', ''),
-            "published_at": review.get('publishAt'),
-            "published_at_date": review.get('publishedAtDate'),
+            "review_text": get('text', ''),
+            "review_text_translated": get('textTranslated'),
+            "review_date": get('publishedAtDate', ''),
+            "published_at": get('publishAt'),
+            "published_at_date": get('publishedAtDate'),
             "verified_purchase": None,  # Google doesn't provide this info
-            "helpful_votes": review.get('likesCount', 0),
-            "response_from_owner_date": review.get('responseFromOwnerDate'),
-            "response_from_owner_text": review.get('responseFromOwnerText'),
-            "review_image_urls": review.get('reviewImageUrls', []),
-            "review_context": review.get('reviewContext', {}),
-            "review_detailed_rating": review.get('reviewDetailedRating', {}),
-            "visited_in": review.get('visitedIn'),
-            "is_advertisement": review.get('isAdvertisement', False),
-            "original_language": review.get('originalLanguage'),
-            "translated_language": review.get('translatedLanguage'),
-            "review_language": review.get('language'),
-            "country_code": review.get('countryCode'),
-            "place_id": review.get('placeId'),
-            "location": review.get('location', {}),
-            "address": review.get('address'),
-            "neighborhood": review.get('neighborhood'),
-            "street": review.get('street'),
-            "city": review.get('city'),
-            "postal_code": review.get('postalCode'),
-            "state": review.get('state'),
-            "category_name": review.get('categoryName'),
-            "categories": review.get('categories', []),
-            "business_title": review.get('title'),
-            "total_score": review.get('totalScore'),
-            "permanently_closed": review.get('permanentlyClosed', False),
-            "temporarily_closed": review.get('temporarilyClosed', False),
-            "reviews_count": review.get('reviewsCount'),
-            "business_url": review.get('url'),
-            "price": review.get('price'),
-            "cid": review.get('cid'),
-            "fid": review.get('fid'),
-            "image_url": review.get('imageUrl'),
-            "source_url": review.get('source_url', ''),
-            "scraped_at": review.get('scraped_at'),
-            "scraper_scraped_at": review.get('scrapedAt'),
-            "search_string": review.get('searchString'),
-            "review_origin": review.get('reviewOrigin'),
-            "review_url": review.get('reviewUrl'),
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
+            "helpful_votes": get('likesCount', 0),
+            "response_from_owner_date": get('responseFromOwnerDate'),
+            "response_from_owner_text": get('responseFromOwnerText'),
+            "review_image_urls": get('reviewImageUrls', []),
+            "review_context": get('reviewContext', {}),
+            "review_detailed_rating": get('reviewDetailedRating', {}),
+            "visited_in": get('visitedIn'),
+            "is_advertisement": get('isAdvertisement', False),
+            "original_language": get('originalLanguage'),
+            "translated_language": get('translatedLanguage'),
+            "review_language": get('language'),
+            "country_code": get('countryCode'),
+            "place_id": get('placeId'),
+            "location": get('location', {}),
+            "address": get('address'),
+            "neighborhood": get('neighborhood'),
+            "street": get('street'),
+            "city": get('city'),
+            "postal_code": get('postalCode'),
+            "state": get('state'),
+            "category_name": get('categoryName'),
+            "categories": get('categories', []),
+            "business_title": get('title'),
+            "total_score": get('totalScore'),
+            "permanently_closed": get('permanentlyClosed', False),
+            "temporarily_closed": get('temporarilyClosed', False),
+            "reviews_count": get('reviewsCount'),
+            "business_url": get('url'),
+            "price": get('price'),
+            "cid": get('cid'),
+            "fid": get('fid'),
+            "image_url": get('imageUrl'),
+            "source_url": get('source_url', ''),
+            "scraped_at": get('scraped_at'),
+            "scraper_scraped_at": get('scrapedAt'),
+            "search_string": get('searchString'),
+            "review_origin": get('reviewOrigin'),
+            "review_url": get('reviewUrl'),
+            "created_at": now,
+            "updated_at": now
         }
     
     def _standardize_trustpilot_review(self, review: Dict) -> Dict:
         """Standardize Trustpilot review to unified format"""
+        # Bind the hot lookups once; this runs for every review being unified
+        get = review.get
+        now = datetime.utcnow()
         return {
             "_id": review["_id"],  # Use original MongoDB ObjectId as unified review ID
-            "original_review_id": review.get('review_id'),
-            "establishment_id": review.get('establishment_id'),
+            "original_review_id": get('review_id'),
+            "establishment_id": get('establishment_id'),
             "platform": "trustpilot",
             "author_name": None,  # Removed from Trustpilot data
             "author_id": None,  # Not available in this structure
             "author_url": None,
             "author_photo_url": None,
-            "author_review_count": review.get('numberOfReviews'),
+            "author_review_count": get('numberOfReviews'),
             "is_local_guide": None,  # Trustpilot doesn't have this concept
-            "rating": review.get('ratingValue', 0),
-            "title": review.get('reviewHeadline', ''),
-            "review_text": review.get('reviewBody', ''),
+            "rating": get('ratingValue', 0),
+            "title": get('reviewHeadline', ''),
+            "review_text": get('reviewBody', ''),
             "review_text_translated": None,  # Not available in Trustpilot
-            "review_date": review.get('datePublished', ''),
+            "review_date": get('datePublished', ''),
             "published_at": None,  # Google-specific field
-            "published_at_date": review.get('datePublished'),
-            "verified_purchase": review.get('verified', False),
-            "verification_level": review.get('verificationLevel'),
-            "helpful_votes": review.get('likes', 0),
+            "published_at_date": get('datePublished'),
+            "verified_purchase": get('verified', False),
+            "verification_level": get('verificationLevel'),
+            "helpful_votes": get('likes', 0),
             "response_from_owner_date": None,  # Not in this data structure
             "response_from_owner_text": None,  # Not in this data structure
             "review_image_urls": [],  # Not in this data structure
@@ -198,8 +307,8 @@ class DatabaseManager:
             "is_advertisement": False,  # Trustpilot doesn't mark ads this way
             "original_language": None,  # Not explicitly available
             "translated_language": None,  # Not available
-            "review_language": review.get('reviewLanguage'),
-            "country_code": review.get('consumerCountryCode'),
+            "review_language": get('reviewLanguage'),
+            "country_code": get('consumerCountryCode'),
             "place_id": None,  # Google-specific
             "location": {},  # Google-specific
             "address": None,  # Google-specific
@@ -220,19 +329,21 @@ class DatabaseManager:
             "cid": None,  # Google-specific
             "fid": None,  # Google-specific
             "image_url": None,  # Google-specific
-            "experience_date": review.get('experienceDate'),
-            "source_url": review.get('source_url', ''),
-            "scraped_at": review.get('scraped_at'),
+            "experience_date": get('experienceDate'),
+            "source_url": get('source_url', ''),
+            "scraped_at": get('scraped_at'),
             "scraper_scraped_at": None,  # Google-specific
-            "review_url": review.get('reviewUrl'),
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
+            "review_url": get('reviewUrl'),
+            "created_at": now,
+            "updated_at": now
         }
     
     def get_existing_unified_review_ids(self) -> set:
         """Get all existing unified review IDs to avoid duplicates"""
-        existing_ids = self.db.unified_reviews.distinct("_id")
-        return set(existing_ids)
+        # Stream a projected cursor; distinct() returns one BSON document capped at 16 MB.
+        # Hinting the _id index makes this a covered index scan instead of a collection scan
+        cursor = self.db.unified_reviews.find({}, {"_id": 1}).hint("_id_").batch_size(10000)
+        return {doc["_id"] for doc in cursor}
     
     def unify_reviews_incremental(self, establishment_ids: List[str] = None) -> Dict[str, int]:
         """
@@ -258,75 +369,47 @@ class DatabaseManager:
             query_filter["establishment_id"] = {"$in": establishment_ids}
         
         unified_count = {"google": 0, "trustpilot": 0}
-        reviews_to_insert = []
         
-        # Process Google reviews
-        self.logger.info("Processing Google reviews...")
-        google_reviews = self.db.google.find(query_filter)
-        
-        for review in google_reviews:
+        # Standardized reviews are streamed from both collections and written in batches
+        # of 1000, so only one batch is held in memory at a time
+        unified_docs = chain(
+            self._iter_unified_docs(self.db.google, query_filter, existing_unified_ids,
+                                    self._standardize_google_review, "google", unified_count),
+            self._iter_unified_docs(self.db.trustpilot, query_filter, existing_unified_ids,
+                                    self._standardize_trustpilot_review, "trustpilot", unified_count)
+        )
+        for chunk in _chunks(unified_docs, 1000):
             try:
-                # Skip if already unified (using MongoDB _id)
-                if review["_id"] in existing_unified_ids:
-                    continue
-                
-                unified_review = self._standardize_google_review(review)
-                reviews_to_insert.append(unified_review)
-                unified_count["google"] += 1
-                
-                # Batch insert every 1000 reviews to manage memory
-                if len(reviews_to_insert) >= 1000:
-                    try:
-                        self.db.unified_reviews.insert_many(reviews_to_insert, ordered=False)
-                        self.logger.info(f"Inserted batch of {len(reviews_to_insert)} unified reviews")
-                    except Exception as e:
-                        self.logger.error(f"Error inserting batch: {str(e)[:200]}...")
-                    reviews_to_insert.clear()
-                    
+                self.db.unified_reviews.insert_many(chunk, ordered=False)
+                self.logger.info(f"Inserted batch of {len(chunk)} unified reviews")
             except Exception as e:
-                self.logger.warning(f"Error processing Google review {review.get('_id', 'unknown')}: {e}")
-                continue
+                self.logger.error(f"Error inserting batch: {str(e)[:200]}...")
         
-        # Process Trustpilot reviews
-        self.logger.info("Processing Trustpilot reviews...")
-        trustpilot_reviews = self.db.trustpilot.find(query_filter)
+        total_unified = unified_count["google"] + unified_count["trustpilot"]
+        self.logger.info(f"Unification complete! Unified {total_unified} new reviews: "
+                        f"Google={unified_count['google']}, Trustpilot={unified_count['trustpilot']}")
         
-        for review in trustpilot_reviews:
+        return unified_count
+    
+    def _iter_unified_docs(self, collection, query_filter: Dict, existing_unified_ids: set,
+                           standardize, platform: str, unified_count: Dict[str, int]) -> Iterator[Dict]:
+        """Yield unified documents for a platform collection's reviews not unified yet, counting them in unified_count"""
+        label = platform.capitalize()
+        self.logger.info(f"Processing {label} reviews...")
+        
+        for review in collection.find(query_filter):
             try:
                 # Skip if already unified (using MongoDB _id)
                 if review["_id"] in existing_unified_ids:
                     continue
                 
-                unified_review = self._standardize_trustpilot_review(review)
-                reviews_to_insert.append(unified_review)
-                unified_count["trustpilot"] += 1
-                
-                # Batch insert every 1000 reviews to manage memory
-                if len(reviews_to_insert) >= 1000:
-                    try:
-                        self.db.unified_reviews.insert_many(reviews_to_insert, ordered=False)
-                        self.logger.info(f"Inserted batch of {len(reviews_to_insert)} unified reviews")
-                    except Exception as e:
-                        self.logger.error(f"Error inserting batch: {str(e)[:200]}...")
-                    reviews_to_insert.clear()
-                    
+                unified_review = standardize(review)
             except Exception as e:
-                self.logger.warning(f"Error processing Trustpilot review {review.get('_id', 'unknown')}: {e}")
+                self.logger.warning(f"Error processing {label} review {review.get('_id', 'unknown')}: {e}")
                 continue
-        
-        # Insert remaining reviews
-        if reviews_to_insert:
-            try:
-                self.db.unified_reviews.insert_many(reviews_to_insert, ordered=False)
-                self.logger.info(f"Inserted final batch of {len(reviews_to_insert)} unified reviews")
-            except Exception as e:
-                self.logger.error(f"Error inserting final batch: {str(e)[:200]}...")
-        
-        total_unified = unified_count["google"] + unified_count["trustpilot"]
-        self.logger.info(f"Unification complete! Unified {total_unified} new reviews: "
-                        f"Google={unified_count['google']}, Trustpilot={unified_count['trustpilot']}")
-        
-        return unified_count
+            
+            unified_count[platform] += 1
+            yield unified_review
     
     def create_unified_reviews_indexes(self):
         """Create indexes on unified_reviews collection for better performance"""
@@ -356,7 +439,8 @@ class DatabaseManager:
             
             platform_stats = list(self.db.unified_reviews.aggregate(pipeline))
             
-            total_reviews = self.db.unified_reviews.count_documents({})
+            # Every document lands in exactly one platform group, so the groups sum to the total
+            total_reviews = sum(stat["count"] for stat in platform_stats)
             
             return {
                 "total_reviews": total_reviews,
@@ -390,17 +474,69 @@ class DatabaseManager:
     
     # NEW LANGUAGE STANDARDIZATION METHODS
     
-    def _detect_language(self, text: str) -> Optional[str]:
-        """Detect language of text using langdetect"""
-        if not text or len(text.strip()) < 5:
-            return None
-        
+    def _get_lang_model(self):
+        """
+        Load the fastText language identification model once per manager.
+        Returns None (logging once) if fastText or the model file is unavailable.
+        """
+        if self.lang_model is None and not self.lang_model_failed:
+            try:
+                import fasttext
+                self.lang_model = fasttext.load_model(LANG_MODEL_PATH)
+            except (ImportError, ValueError) as e:
+                self.lang_model_failed = True
+                self.logger.error(f"fastText language model unavailable ({LANG_MODEL_PATH}): {e}. "
+                                  f"Falling back to langdetect")
+        return self.lang_model
+    
+    def _detect_language_fallback(self, text: str) -> Optional[str]:
+        """Detect language of text using langdetect when fastText is unavailable"""
         try:
+            import langdetect
             detected = langdetect.detect(text)
             return detected if detected else None
-        except:
+        except Exception:
             return None  # Failed detection = assume needs translation
     
+    def _detect_languages(self, texts: List[Optional[str]]) -> List[Optional[str]]:
+        """Detect languages of a batch of texts with a single fastText prediction call"""
+        languages = [None] * len(texts)
+        pending = {}  # text hash -> (text, positions in texts)
+        
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < 5:
+                continue
+            
+            text_hash = xxhash.xxh64_intdigest(text)
+            if text_hash in self.language_cache:
+                languages[i] = self.language_cache[text_hash]
+            elif text_hash in pending:
+                pending[text_hash][1].append(i)
+            else:
+                pending[text_hash] = (text, [i])
+        
+        if not pending:
+            return languages
+        
+        model = self._get_lang_model()
+        if model is None:
+            detected = [self._detect_language_fallback(text) for text, _ in pending.values()]
+        else:
+            try:
+                # fastText predicts one line at a time, so newlines must be flattened
+                labels, _ = model.predict([text.replace('\n', ' ') for text, _ in pending.values()], k=1)
+            except Exception as e:
+                self.logger.warning(f"Language detection failed for batch: {e}")
+                return languages  # Failed detection = assume needs translation
+            detected = [label[0].replace('__label__', '') if label else None for label in labels]
+        
+        for (text_hash, (_, positions)), language in zip(pending.items(), detected):
+            self.language_cache[text_hash] = language
+            for i in positions:
+                languages[i] = language
+        
+        return languages
+    
     def _get_text_hash(self, text: str) -> str:
         """Generate hash for text caching"""
         return hashlib.md5(text.encode('utf-8')).hexdigest()
@@ -463,39 +599,49 @@ class DatabaseManager:
             self.logger.error(f"Translation failed for text: {str(e)}")
             return text  # Return original text on failure
     
-    def _standardize_google_review_ls(self, review: Dict) -> Dict:
-        """Standardize Google review for language standardization"""
+    def _standardize_google_review_ls(self, review: Dict, response_language: Optional[str]) -> Tuple[Dict, List[str]]:
+        """
+        Standardize Google review for language standardization.
+        Returns the standardized review and the translation counter keys it contributes to.
+        """
         # Start with the unified review
         ls_review = review.copy()
+        translated_fields = []
         
-        # Detect language of owner response
+        # Language of owner response is detected per batch by the caller
         response_text = review.get('response_from_owner_text')
-        response_language = self._detect_language(response_text)
         ls_review['response_from_owner_language'] = response_language
+        ls_review['has_owner_response'] = response_text is not None
         
         # Translate owner response if not English
         if response_text and response_language and response_language != 'en':
             translated_response = self._translate_text(response_text, response_language)
             ls_review['response_from_owner_text'] = translated_response
+            translated_fields.append("google_responses")
         
         # Update timestamps
         ls_review['updated_at'] = datetime.utcnow()
         
-        return ls_review
+        return ls_review, translated_fields
     
-    def _standardize_trustpilot_review_ls(self, review: Dict) -> Dict:
-        """Standardize Trustpilot review for language standardization"""
+    def _standardize_trustpilot_review_ls(self, review: Dict, response_language: Optional[str]) -> Tuple[Dict, List[str]]:
+        """
+        Standardize Trustpilot review for language standardization.
+        Returns the standardized review and the translation counter keys it contributes to.
+        """
         # Start with the unified review
         ls_review = review.copy()
+        translated_fields = []
         
-        # Detect language of owner response
+        # Language of owner response is detected per batch by the caller
         response_text = review.get('response_from_owner_text')
-        response_language = self._detect_language(response_text)
         ls_review['response_from_owner_language'] = response_language
+        ls_review['has_owner_response'] = response_text is not None
         
         # Translate review content if not English
         review_language = review.get('review_language')
         if review_language and review_language != 'en':
+            translated_fields.append("trustpilot_content")
             title = review.get('title', '')
             review_text = review.get('review_text', '')
             
@@ -517,20 +663,39 @@ class DatabaseManager:
         if response_text and response_language and response_language != 'en':
             translated_response = self._translate_text(response_text, response_language)
             ls_review['response_from_owner_text'] = translated_response
+            translated_fields.append("trustpilot_responses")
         
         # Update timestamps
         ls_review['updated_at'] = datetime.utcnow()
         
-        return ls_review
+        return ls_review, translated_fields
     
-    def get_existing_ls_unified_review_ids(self) -> set:
-        """Get all existing language standardized review IDs to avoid duplicates"""
-        try:
-            existing_ids = self.db.ls_unified_reviews.distinct("_id")
-            return set(existing_ids)
-        except:
-            # Collection doesn't exist yet
+    def get_existing_ls_unified_review_ids(self) -> ScalableBloomFilter:
+        """
+        Get a Bloom filter of existing language standardized review IDs to avoid duplicates.
+        Membership is probabilistic (~1% false positives), so hits must be confirmed
+        with _confirm_existing_ls_review_ids before a review is skipped.
+        
+        Database errors propagate: an empty filter would make every review look new
+        and re-translate all of them. A missing collection simply yields no IDs.
+        """
+        # The count is only a sizing hint from metadata; the filter grows if it is stale
+        expected_count = self.db.ls_unified_reviews.estimated_document_count()
+        existing_ids = ScalableBloomFilter(initial_capacity=max(expected_count, 1000), error_rate=0.01)
+        
+        # Covered by the _id index, so no documents are fetched
+        for doc in self.db.ls_unified_reviews.find({}, {"_id": 1}).hint("_id_").batch_size(10000):
+            existing_ids.add(doc["_id"])
+        return existing_ids
+    
+    def _confirm_existing_ls_review_ids(self, review_ids: List, existing_ids: ScalableBloomFilter) -> set:
+        """Confirm Bloom filter hits against ls_unified_reviews in a single round trip"""
+        candidate_ids = [review_id for review_id in review_ids if review_id in existing_ids]
+        if not candidate_ids:
             return set()
+        
+        confirmed = self.db.ls_unified_reviews.find({"_id": {"$in": candidate_ids}}, {"_id": 1})
+        return {doc["_id"] for doc in confirmed}
     
     def create_ls_unified_reviews_indexes(self):
         """Create indexes on ls_unified_reviews collection for better performance"""
@@ -542,16 +707,43 @@ class DatabaseManager:
             self.db.ls_unified_reviews.create_index("response_from_owner_language")
             self.db.ls_unified_reviews.create_index([("establishment_id", 1), ("platform", 1)])
             
+            # Covers the per-platform aggregation in get_ls_unified_reviews_stats. Reviews
+            # standardized before has_owner_response existed are backfilled once, before
+            # the index is first built
+            if "platform_1_rating_1_has_owner_response_1" not in self.db.ls_unified_reviews.index_information():
+                self.db.ls_unified_reviews.update_many(
+                    {"has_owner_response": {"$exists": False}},
+                    [{"$set": {"has_owner_response": {
+                        "$ne": [{"$ifNull": ["$response_from_owner_text", None]}, None]
+                    }}}]
+                )
+                self.db.ls_unified_reviews.create_index(
+                    [("platform", 1), ("rating", 1), ("has_owner_response", 1)]
+                )
+            
             self.logger.info("Created indexes on ls_unified_reviews collection")
         except Exception as e:
             self.logger.error(f"Error creating indexes: {e}")
     
-    def _count_translations_needed(self, establishment_ids: List[str] = None) -> Dict[str, int]:
-        """Count how many translations will be needed before starting standardization"""
-        self.logger.info("Counting translations needed...")
+    def _count_unified_reviews(self, query_filter: Dict) -> int:
+        """Count unified reviews for progress tracking without a full collection scan"""
+        if not query_filter:
+            # O(1) collection metadata read
+            return self.db.unified_reviews.estimated_document_count()
+        
+        # Uses the establishment_id index from create_unified_reviews_indexes when it exists
+        return self.db.unified_reviews.count_documents(query_filter)
+    
+    def _count_translations_needed(self, existing_ls_ids: ScalableBloomFilter,
+                                   establishment_ids: List[str] = None) -> Dict[str, int]:
+        """
+        Count how many translations will be needed before starting standardization
         
-        # Get existing standardized review IDs to avoid counting duplicates
-        existing_ls_ids = self.get_existing_ls_unified_review_ids()
+        Args:
+            existing_ls_ids: Existing standardized review IDs (skipped when counting)
+            establishment_ids: Optional list of establishment IDs to count
+        """
+        self.logger.info("Counting translations needed...")
         
         # Build query filter
         query_filter = {}
@@ -561,15 +753,16 @@ class DatabaseManager:
         translation_count = {"google_responses": 0, "trustpilot_content": 0, "trustpilot_responses": 0}
         
         # Process in batches to avoid cursor timeout
-        total_reviews = self.db.unified_reviews.count_documents(query_filter)
+        total_reviews = self._count_unified_reviews(query_filter)
         processed_count = 0
         batch_size = 1000
         
-        while processed_count < total_reviews:
+        # The total is only an estimate for progress logging; stop on the first empty batch
+        while True:
             # Get batch of reviews
             reviews_batch = list(
                 self.db.unified_reviews
-                .find(query_filter)
+                .find(query_filter, TRANSLATION_COUNT_PROJECTION)
                 .skip(processed_count)
                 .limit(batch_size)
             )
@@ -577,16 +770,20 @@ class DatabaseManager:
             if not reviews_batch:
                 break
             
-            for review in reviews_batch:
-                if review["_id"] in existing_ls_ids:
-                    continue
-                    
+            confirmed_ls_ids = self._confirm_existing_ls_review_ids(
+                [review["_id"] for review in reviews_batch], existing_ls_ids
+            )
+            new_reviews = [review for review in reviews_batch if review["_id"] not in confirmed_ls_ids]
+            response_languages = self._detect_languages(
+                [review.get('response_from_owner_text') for review in new_reviews]
+            )
+            
+            for review, response_language in zip(new_reviews, response_languages):
                 platform = review.get('platform')
                 
                 if platform == 'google':
                     response_text = review.get('response_from_owner_text')
                     if response_text:
-                        response_language = self._detect_language(response_text)
                         if response_language and response_language != 'en':
                             translation_count["google_responses"] += 1
                 
@@ -603,7 +800,6 @@ class DatabaseManager:
                     # Check owner response
                     response_text = review.get('response_from_owner_text')
                     if response_text:
-                        response_language = self._detect_language(response_text)
                         if response_language and response_language != 'en':
                             translation_count["trustpilot_responses"] += 1
             
@@ -617,49 +813,88 @@ class DatabaseManager:
                         f"Trustpilot responses: {translation_count['trustpilot_responses']})")
         
         return translation_count
-    def standardize_reviews_incremental(self, establishment_ids: List[str] = None) -> Dict[str, int]:
+    
+    def _iter_ls_docs(self, query_filter: Dict, existing_ls_ids: ScalableBloomFilter, progress: Dict) -> Iterator[Dict]:
         """
-        Incrementally standardize reviews from unified_reviews collection.
-        Only processes reviews that haven't been standardized yet.
-        
-        Args:
-            establishment_ids: Optional list of establishment IDs to process. 
-                              If None, processes all establishments.
-        
-        Returns:
-            Dictionary with counts of standardized reviews by platform
+        Yield language standardized documents for unified reviews not standardized yet.
+        Updates the counters in progress as it goes. A KeyboardInterrupt ends the stream
+        early and sets progress["interrupted"], so the caller can still save what was yielded.
         """
-        self.logger.info("Starting incremental review language standardization...")
-        
-        # Count translations needed first
-        translation_estimates = self._count_translations_needed(establishment_ids)
-        total_translations_needed = sum(translation_estimates.values())
-        
-        if total_translations_needed > 0:
-            self.logger.info(f"\n{'='*60}")
-            self.logger.info(f"TRANSLATION ESTIMATE: {total_translations_needed} texts need translation")
-            self.logger.info(f"Google owner responses: {translation_estimates['google_responses']}")
-            self.logger.info(f"Trustpilot review content: {translation_estimates['trustpilot_content']}")
-            self.logger.info(f"Trustpilot owner responses: {translation_estimates['trustpilot_responses']}")
-            self.logger.info(f"{'='*60}")
-        
-        # Initialize translation counter
-        self.translation_counter = 0
-        self.translation_total = total_translations_needed
-        
-        # Get existing standardized review IDs to avoid duplicates
-        existing_ls_ids = self.get_existing_ls_unified_review_ids()
-        self.logger.info(f"Found {len(existing_ls_ids)} existing language standardized reviews")
+        standardized_count = progress["standardized"]
+        translation_count = progress["translations_needed"]
+        standardizers = {
+            'google': (self._standardize_google_review_ls, 'google'),
+            'trustpilot': (self._standardize_trustpilot_review_ls, 'trustpilot')
+        }
         
-        # Build query filter
-        query_filter = {}
-        if establishment_ids:
-            query_filter["establishment_id"] = {"$in": establishment_ids}
+        # Get total count for progress tracking
+        total_reviews_to_process = self._count_unified_reviews(query_filter)
+        processed_count = 0
+        batch_size = 500  # Smaller batch size to avoid cursor timeout
         
-        standardized_count = {"google": 0, "trustpilot": 0}
-        reviews_to_insert = []
-        translation_count = {"google_responses": 0, "trustpilot_content": 0, "trustpilot_responses": 0}
+        try:
+            # The total is only an estimate for progress logging; stop on the first empty batch
+            while True:
+                # Get a batch of reviews with skip and limit
+                unified_reviews_batch = list(
+                    self.db.unified_reviews
+                    .find(query_filter)
+                    .skip(processed_count)
+                    .limit(batch_size)
+                )
+                
+                if not unified_reviews_batch:
+                    break
+                
+                self.logger.info(f"Processing batch {processed_count//batch_size + 1}: "
+                               f"reviews {processed_count + 1}-{processed_count + len(unified_reviews_batch)} "
+                               f"of {total_reviews_to_process}")
+                
+                confirmed_ls_ids = self._confirm_existing_ls_review_ids(
+                    [review["_id"] for review in unified_reviews_batch], existing_ls_ids
+                )
+                # Skip if already standardized (using MongoDB _id)
+                new_reviews = [review for review in unified_reviews_batch if review["_id"] not in confirmed_ls_ids]
+                response_languages = self._detect_languages(
+                    [review.get('response_from_owner_text') for review in new_reviews]
+                )
+                
+                for review, response_language in zip(new_reviews, response_languages):
+                    try:
+                        platform = review.get('platform')
+                        entry = standardizers.get(platform)
+                        if entry is None:
+                            self.logger.warning(f"Unknown platform: {platform}")
+                            continue
+                        
+                        standardize, platform_key = entry
+                        ls_review, translated_fields = standardize(review, response_language)
+                        standardized_count[platform_key] += 1
+                        
+                        # Count translations
+                        for field in translated_fields:
+                            translation_count[field] += 1
+                            
+                    except Exception as e:
+                        self.logger.warning(f"Error processing review {review.get('_id', 'unknown')}: {e}")
+                        continue
+                    
+                    yield ls_review
+                
+                processed_count += len(unified_reviews_batch)
         
+        except KeyboardInterrupt:
+            self.logger.info("\nTranslation process interrupted by user")
+            progress["interrupted"] = True
+    
+    def _insert_ls_reviews(self, ls_reviews: List[Dict]):
+        """Insert a chunk of standardized reviews in one unordered bulk write"""
+        try:
+            self.db.ls_unified_reviews.bulk_write([InsertOne(review) for review in ls_reviews], ordered=False)
+            self.logger.info(f"Inserted batch of {len(ls_reviews)} standardized reviews")
+        except Exception as e:
+            self.logger.error(f"Error inserting batch: {str(e)[:200]}...")
+    
     def standardize_reviews_incremental(self, establishment_ids: List[str] = None) -> Dict[str, int]:
         """
         Incrementally standardize reviews from unified_reviews collection.
@@ -674,8 +909,12 @@ class DatabaseManager:
         """
         self.logger.info("Starting incremental review language standardization...")
         
+        # Existing standardized review IDs, shared by the estimate and the standardization pass
+        existing_ls_ids = self.get_existing_ls_unified_review_ids()
+        self.logger.info(f"Found {len(existing_ls_ids)} existing language standardized reviews")
+        
         # Count translations needed first
-        translation_estimates = self._count_translations_needed(establishment_ids)
+        translation_estimates = self._count_translations_needed(existing_ls_ids, establishment_ids)
         total_translations_needed = sum(translation_estimates.values())
         
         if total_translations_needed > 0:
@@ -690,139 +929,29 @@ class DatabaseManager:
         self.translation_counter = 0
         self.translation_total = total_translations_needed
         
-        # Get existing standardized review IDs to avoid duplicates
-        existing_ls_ids = self.get_existing_ls_unified_review_ids()
-        self.logger.info(f"Found {len(existing_ls_ids)} existing language standardized reviews")
-        
         # Build query filter
         query_filter = {}
         if establishment_ids:
             query_filter["establishment_id"] = {"$in": establishment_ids}
         
         standardized_count = {"google": 0, "trustpilot": 0}
-        reviews_to_insert = []
         translation_count = {"google_responses": 0, "trustpilot_content": 0, "trustpilot_responses": 0}
+        progress = {
+            "standardized": standardized_count,
+            "translations_needed": translation_count,
+            "interrupted": False
+        }
         
         # Process reviews in batches to avoid cursor timeout
         self.logger.info("Processing unified reviews for language standardization...")
         
-        # Get total count for progress tracking
-        total_reviews_to_process = self.db.unified_reviews.count_documents(query_filter)
-        processed_count = 0
-        batch_size = 500  # Smaller batch size to avoid cursor timeout
-        
-        try:
-            while processed_count < total_reviews_to_process:
-                # Get a batch of reviews with skip and limit
-                unified_reviews_batch = list(
-                    self.db.unified_reviews
-                    .find(query_filter)
-                    .skip(processed_count)
-                    .limit(batch_size)
-                )
-                
-                if not unified_reviews_batch:
-                    break
-                
-                self.logger.info(f"Processing batch {processed_count//batch_size + 1}: "
-                               f"reviews {processed_count + 1}-{processed_count + len(unified_reviews_batch)} "
-                               f"of {total_reviews_to_process}")
-                
-                for review in unified_reviews_batch:
-                    try:
-                        # Skip if already standardized (using MongoDB _id)
-                        if review["_id"] in existing_ls_ids:
-                            continue
-                        
-                        platform = review.get('platform')
-                        
-                        if platform == 'google':
-                            ls_review = self._standardize_google_review_ls(review)
-                            standardized_count["google"] += 1
-                            
-                            # Count translations
-                            if (review.get('response_from_owner_text') and 
-                                ls_review.get('response_from_owner_language') and 
-                                ls_review.get('response_from_owner_language') != 'en'):
-                                translation_count["google_responses"] += 1
-                                
-                        elif platform == 'trustpilot':
-                            ls_review = self._standardize_trustpilot_review_ls(review)
-                            standardized_count["trustpilot"] += 1
-                            
-                            # Count translations
-                            if (review.get('review_language') and 
-                                review.get('review_language') != 'en'):
-                                translation_count["trustpilot_content"] += 1
-                            
-                            if (review.get('response_from_owner_text') and 
-                                ls_review.get('response_from_owner_language') and 
-                                ls_review.get('response_from_owner_language') != 'en'):
-                                translation_count["trustpilot_responses"] += 1
-                        
-                        else:
-                            self.logger.warning(f"Unknown platform: {platform}")
-                            continue
-                        
-                        reviews_to_insert.append(ls_review)
-                        
-                        # Batch insert every 1000 reviews to manage memory
-                        if len(reviews_to_insert) >= 1000:
-                            try:
-                                self.db.ls_unified_reviews.insert_many(reviews_to_insert, ordered=False)
-                                self.logger.info(f"Inserted batch of {len(reviews_to_insert)} standardized reviews")
-                            except Exception as e:
-                                self.logger.error(f"Error inserting batch: {str(e)[:200]}...")
-                            reviews_to_insert.clear()
-                            
-                    except Exception as e:
-                        self.logger.warning(f"Error processing review {review.get('_id', 'unknown')}: {e}")
-                        continue
-                
-                processed_count += len(unified_reviews_batch)
-                
-                # Insert any remaining reviews from this batch
-                if reviews_to_insert:
-                    try:
-                        self.db.ls_unified_reviews.insert_many(reviews_to_insert, ordered=False)
-                        self.logger.info(f"Inserted batch of {len(reviews_to_insert)} standardized reviews")
-                    except Exception as e:
-                        self.logger.error(f"Error inserting batch: {str(e)[:200]}...")
-                    reviews_to_insert.clear()
-        
-        except KeyboardInterrupt:
-            self.logger.info("\nTranslation process interrupted by user")
-            # Save any pending reviews before exiting
-            if reviews_to_insert:
-                try:
-                    self.db.ls_unified_reviews.insert_many(reviews_to_insert, ordered=False)
-                    self.logger.info(f"Saved {len(reviews_to_insert)} reviews before exit")
-                except:
-                    pass
-            raise
-        
-        # Insert any final remaining reviews
-        if reviews_to_insert:
-            try:
-                self.db.ls_unified_reviews.insert_many(reviews_to_insert, ordered=False)
-                self.logger.info(f"Inserted final batch of {len(reviews_to_insert)} standardized reviews")
-            except Exception as e:
-                self.logger.error(f"Error inserting final batch: {str(e)[:200]}...")
-        
-        total_standardized = standardized_count["google"] + standardized_count["trustpilot"]
-        total_translations = sum(translation_count.values())
-        
-        self.logger.info(f"\n{'='*60}")
-        self.logger.info(f"Language standardization complete!")
-        self.logger.info(f"Standardized {total_standardized} new reviews: "
-                        f"Google={standardized_count['google']}, Trustpilot={standardized_count['trustpilot']}")
-        self.logger.info(f"Total translations performed: {getattr(self, 'translation_counter', 0)}")
-        self.logger.info(f"{'='*60}")
+        ls_reviews = self._iter_ls_docs(query_filter, existing_ls_ids, progress)
+        for chunk in _chunks(ls_reviews, 1000):
+            self._insert_ls_reviews(chunk)
         
-        return {
-            "standardized": standardized_count,
-            "translations_needed": translation_count
-        }
+        if progress["interrupted"]:
+            # Pending reviews were flushed by the loop above
+            raise KeyboardInterrupt
         
         total_standardized = standardized_count["google"] + standardized_count["trustpilot"]
         total_translations = sum(translation_count.values())
@@ -843,15 +972,16 @@ class DatabaseManager:
         """Get statistics about language standardized reviews"""
         try:
             pipeline = [
+                # Sorting on the grouping key lets the planner use the (platform, rating,
+                # has_owner_response) index when it exists, and fall back to a scan when not
+                {"$sort": {"platform": 1}},
                 {
                     "$group": {
                         "_id": "$platform",
                         "count": {"$sum": 1},
                         "avg_rating": {"$avg": "$rating"},
                         "has_owner_response": {
-                            "$sum": {
-                                "$cond": [{"$ne": ["$response_from_owner_text", None]}, 1, 0]
-                            }
+                            "$sum": {"$cond": ["$has_owner_response", 1, 0]}
                         }
                     }
                 }
@@ -874,7 +1004,8 @@ class DatabaseManager:
             
             response_lang_stats = list(self.db.ls_unified_reviews.aggregate(response_lang_pipeline))
             
-            total_reviews = self.db.ls_unified_reviews.count_documents({})
+            # Every document lands in exactly one platform group, so the groups sum to the total
+            total_reviews = sum(stat["count"] for stat in platform_stats)
             
             return {
                 "total_reviews": total_reviews,
@@ -897,20 +1028,36 @@ class DatabaseManager:
             platform: Optional platform filter ('google' or 'trustpilot')
             limit: Optional limit on number of reviews returned
         """
-        query = {"establishment_id": establishment_id}
-        if platform:
-            query["platform"] = platform
-        
         try:
-            cursor = self.db.ls_unified_reviews.find(query).sort("review_date", -1)
-            if limit:
-                cursor = cursor.limit(limit)
-            
-            return list(cursor)
+            return list(self.iter_ls_unified_reviews_by_establishment(establishment_id, platform, limit))
         except Exception as e:
             self.logger.error(f"Error fetching LS reviews: {e}")
             return []
     
+    def iter_ls_unified_reviews_by_establishment(self, establishment_id: str, 
+                                               platform: str = None, 
+                                               limit: int = None) -> Iterable[Dict]:
+        """
+        Stream language standardized reviews for a specific establishment from a lazy cursor.
+        Database errors are raised while iterating.
+        
+        Args:
+            establishment_id: The establishment ID
+            platform: Optional platform filter ('google' or 'trustpilot')
+            limit: Optional limit on number of reviews returned
+        """
+        query = {"establishment_id": establishment_id}
+        if platform:
+            query["platform"] = platform
+        
+        # A batch size equal to a small limit fetches the whole result in one round trip
+        cursor = self.db.ls_unified_reviews.find(query).sort("review_date", -1)
+        cursor = cursor.batch_size(min(limit or 1000, 1000))
+        if limit:
+            cursor = cursor.limit(limit)
+        
+        return cursor
+    
     def close_connection(self):
         """Close database connection"""
         if self.client:
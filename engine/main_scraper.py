@@ -1,28 +1,54 @@
 # engine/main_scraper.py
 import os
 import sys
+import asyncio
+import json
 import logging
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import List, Optional
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
-from database.db_manager import DatabaseManager
+from database.db_manager import DatabaseManager, ESTABLISHMENT_PROJECTION
 from utils.excel_reader import ExcelReader
 from scrapers.apify_client import ApifyClient
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 class ReviewScraper:
-    def __init__(self):
-        self.db_manager = DatabaseManager()
+    def __init__(self, db_manager: Optional[DatabaseManager] = None, apify_client: Optional[ApifyClient] = None):
+        """
+        Args:
+            db_manager: Connected database manager to reuse (a new one is created by default)
+            apify_client: Apify client to reuse; otherwise created by initialize()
+        """
+        self.db_manager = db_manager or DatabaseManager()
         self.excel_reader = ExcelReader()
-        self.apify_client = None
+        self.apify_client = apify_client
         self.config = None
         self.logger = self._setup_logging()
+        
+        # Establishments scraped at the same time when config.yaml has no scraping.concurrency
+        self.DEFAULT_CONCURRENCY = 4
+        
+        # Platforms that can be scraped per establishment
+        self.PLATFORMS = ('google', 'trustpilot')
+        
+        # Worker threads for the blocking Apify and MongoDB calls, created per scrape run
+        self._executor = None
     
     def _setup_logging(self):
         """Setup logging configuration"""
+        # basicConfig is a no-op once the root logger has handlers (e.g. when driven by the
+        # operations controller), so skip it rather than open an unused scraper.log
+        if logging.getLogger().handlers:
+            return logging.getLogger(__name__)
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -33,20 +59,42 @@ class ReviewScraper:
         )
         return logging.getLogger(__name__)
     
-    def _load_config(self):
-        """Load configuration from YAML file"""
+    def _load_config(self, config_path: str = 'config.yaml'):
+        """Load configuration from YAML file, reusing a JSON snapshot while it is up to date"""
+        snapshot_path = f"{config_path}.json"
         try:
-            with open('config.yaml', 'r') as f:
-                self.config = yaml.safe_load(f)
+            config_mtime = os.path.getmtime(config_path)
+            
+            self.config = None
+            if os.path.exists(snapshot_path) and os.path.getmtime(snapshot_path) >= config_mtime:
+                try:
+                    with open(snapshot_path, 'r') as f:
+                        self.config = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    self.logger.warning(f"Ignoring unreadable config snapshot '{snapshot_path}': {e}")
+            
+            if self.config is None:
+                with open(config_path, 'r') as f:
+                    self.config = yaml.load(f, Loader=YAML_LOADER)
+                self._write_config_snapshot(snapshot_path)
+            
             self.logger.info("Configuration loaded successfully")
             return True
         except FileNotFoundError:
-            self.logger.error("Config file 'config.yaml' not found")
+            self.logger.error(f"Config file '{config_path}' not found")
             return False
         except yaml.YAMLError as e:
             self.logger.error(f"Error parsing config file: {e}")
             return False
     
+    def _write_config_snapshot(self, snapshot_path: str):
+        """Write the parsed config as JSON so later runs can skip YAML parsing"""
+        try:
+            with open(snapshot_path, 'w') as f:
+                json.dump(self.config, f)
+        except (OSError, TypeError) as e:
+            self.logger.warning(f"Could not write config snapshot '{snapshot_path}': {e}")
+    
     def _load_tokens(self):
         """Load API tokens from files specified in config"""
         try:
@@ -109,11 +157,41 @@ class ReviewScraper:
             self.logger.error("No establishments found in Excel file")
             return []
         
+        return self.resolve_establishments(establishments)
+    
+    def resolve_establishments(self, establishments: List[dict], ttl_hours: float = 0,
+                               force: bool = False) -> List[dict]:
+        """
+        Match establishments read from Excel to their database records, creating missing ones
+        
+        Args:
+            establishments: Establishments as returned by ExcelReader.read_establishments
+            ttl_hours: Skip platforms scraped within this many hours (0 scrapes every platform)
+            force: Scrape every platform regardless of when it was last scraped
+        
+        Returns:
+            Establishment dicts for scrape_establishments, with the platforms
+            to skip in 'skip_platforms'
+        """
+        # Look up all existing establishments in a single query
+        self.db_manager.create_establishments_indexes()
+        existing_by_url = self.db_manager.get_establishments_by_urls(
+            [est['google_url'] for est in establishments],
+            projection={**ESTABLISHMENT_PROJECTION, 'google_last_scraped': 1, 'trustpilot_last_scraped': 1}
+        )
+        
+        # Create all missing establishments in a single bulk insert
+        new_by_url = {}
+        for est in establishments:
+            if est['google_url'] not in existing_by_url:
+                new_by_url.setdefault(est['google_url'], est)
+        new_ids = self.db_manager.create_establishments(list(new_by_url.values()))
+        new_id_by_url = dict(zip(new_by_url, new_ids))
+        
         # Process each establishment
         processed_establishments = []
         for est in establishments:
-            # Check if establishment already exists
-            existing = self.db_manager.get_establishment_by_url(est['google_url'])
+            existing = existing_by_url.get(est['google_url'])
             
             if existing:
                 self.logger.info(f"Establishment already exists: {est['display_name']}")
@@ -122,52 +200,98 @@ class ReviewScraper:
                     'display_name': existing['display_name'],
                     'google_url': existing['google_url'],
                     'website': existing['website'],
-                    'existing': True
+                    'existing': True,
+                    'skip_platforms': self._recently_scraped_platforms(existing, ttl_hours, force)
                 })
             else:
-                # Create new establishment
-                establishment_id = self.db_manager.create_establishment(
-                    est['display_name'],
-                    est['google_url'],
-                    est['website']
-                )
                 processed_establishments.append({
-                    'id': establishment_id,
+                    'id': new_id_by_url[est['google_url']],
                     'display_name': est['display_name'],
                     'google_url': est['google_url'],
                     'website': est['website'],
-                    'existing': False
+                    'existing': False,
+                    'skip_platforms': ()
                 })
         
         return processed_establishments
     
+    def _recently_scraped_platforms(self, establishment: dict, ttl_hours: float, force: bool) -> tuple:
+        """Get the platforms an existing establishment was scraped on within the TTL"""
+        if force or ttl_hours <= 0:
+            return ()
+        
+        cutoff = datetime.utcnow() - timedelta(hours=ttl_hours)
+        return tuple(
+            platform for platform in self.PLATFORMS
+            if establishment.get(f'{platform}_last_scraped') and establishment[f'{platform}_last_scraped'] > cutoff
+        )
+    
+    def _scrape_google(self, establishment: dict) -> int:
+        """Scrape and save Google reviews for a single establishment"""
+        self.logger.info(f"Scraping Google Maps reviews for: {establishment['display_name']}")
+        google_reviews = self.apify_client.scrape_google_reviews_iter(establishment['google_url'])
+        google_count = self.db_manager.save_google_reviews_stream(establishment['id'], google_reviews)
+        return google_count
+    
+    def _scrape_trustpilot(self, establishment: dict) -> int:
+        """Scrape and save Trustpilot reviews for a single establishment"""
+        self.logger.info(f"Scraping Trustpilot reviews for: {establishment['display_name']}")
+        trustpilot_reviews = self.apify_client.scrape_trustpilot_reviews_iter(establishment['website'])
+        trustpilot_count = self.db_manager.save_trustpilot_reviews_stream(establishment['id'], trustpilot_reviews)
+        return trustpilot_count
+    
+    def _scrape_concurrency(self) -> int:
+        """Number of establishments scraped at the same time, from scraping.concurrency in config.yaml"""
+        if self.config is None and not self._load_config():
+            return self.DEFAULT_CONCURRENCY
+        return self.config.get('scraping', {}).get('concurrency', self.DEFAULT_CONCURRENCY)
+    
+    def _run_blocking(self, func, *args):
+        """Run a blocking call on this scrape run's worker threads"""
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    
     def scrape_establishment_reviews(self, establishment: dict):
-        """Scrape reviews for a single establishment"""
+        """Scrape reviews for a single establishment (blocking; see scrape_establishment_reviews_async)"""
+        return asyncio.run(self.scrape_establishment_reviews_async(establishment))
+    
+    async def scrape_establishment_reviews_async(self, establishment: dict):
+        """
+        Scrape reviews for a single establishment, running its platforms concurrently
+        
+        Args:
+            establishment: Establishment dict; an optional 'skip_platforms' tuple
+                           ('google', 'trustpilot') lists platforms not to scrape
+        """
         self.logger.info(f"Scraping reviews for: {establishment['display_name']}")
         
-        # Scrape Google reviews
-        self.logger.info("Scraping Google Maps reviews...")
-        google_reviews = self.apify_client.scrape_google_reviews(establishment['google_url'])
-        google_count = self.db_manager.save_google_reviews(establishment['id'], google_reviews)
+        scrapers = {'google': self._scrape_google, 'trustpilot': self._scrape_trustpilot}
+        for platform in establishment.get('skip_platforms', ()):
+            self.logger.info(f"Skipping {platform} for {establishment['display_name']}: scraped recently")
+            del scrapers[platform]
         
-        # Update establishment with Google scrape info
-        self.db_manager.update_establishment_scrape_info(
-            establishment['id'], 
-            'google', 
-            google_count
+        # The Apify and MongoDB clients are blocking, so each platform runs in a worker thread
+        results = await asyncio.gather(
+            *(self._run_blocking(scrape, establishment) for scrape in scrapers.values()),
+            return_exceptions=True
         )
         
-        # Scrape Trustpilot reviews
-        self.logger.info("Scraping Trustpilot reviews...")
-        trustpilot_reviews = self.apify_client.scrape_trustpilot_reviews(establishment['website'])
-        trustpilot_count = self.db_manager.save_trustpilot_reviews(establishment['id'], trustpilot_reviews)
+        platform_counts = {}
+        for platform, result in zip(scrapers, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error scraping {platform} for {establishment['display_name']}: {result}")
+            else:
+                platform_counts[platform] = result
         
-        # Update establishment with Trustpilot scrape info
-        self.db_manager.update_establishment_scrape_info(
-            establishment['id'], 
-            'trustpilot', 
-            trustpilot_count
-        )
+        # Record only the successfully scraped platforms so failed ones are retried on the next run
+        if platform_counts:
+            await self._run_blocking(
+                self.db_manager.update_establishment_scrape_infos,
+                establishment['id'],
+                platform_counts
+            )
+        
+        google_count = platform_counts.get('google', 0)
+        trustpilot_count = platform_counts.get('trustpilot', 0)
         
         self.logger.info(f"Completed scraping for {establishment['display_name']}: "
                         f"Google={google_count}, Trustpilot={trustpilot_count}")
@@ -178,6 +302,47 @@ class ReviewScraper:
             'trustpilot_reviews': trustpilot_count
         }
     
+    async def scrape_establishments_async(self, establishments: List[dict]) -> List[dict]:
+        """
+        Scrape establishments concurrently, bounded by the configured concurrency.
+        Use this where an event loop is already running, e.g. in Jupyter.
+        """
+        concurrency = self._scrape_concurrency()
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def scrape_bounded(i: int, establishment: dict):
+            async with semaphore:
+                self.logger.info(f"Processing {i}/{len(establishments)}: {establishment['display_name']}")
+                return await self.scrape_establishment_reviews_async(establishment)
+        
+        # Two worker threads per in-flight establishment (Google + Trustpilot), owned by this run
+        # rather than installed as the loop's default executor
+        with ThreadPoolExecutor(max_workers=concurrency * 2) as executor:
+            self._executor = executor
+            try:
+                outcomes = await asyncio.gather(
+                    *(scrape_bounded(i, establishment) for i, establishment in enumerate(establishments, 1)),
+                    return_exceptions=True
+                )
+            finally:
+                self._executor = None
+        
+        results = []
+        for establishment, outcome in zip(establishments, outcomes):
+            if isinstance(outcome, Exception):
+                self.logger.error(f"Error scraping {establishment['display_name']}: {outcome}")
+                continue
+            results.append(outcome)
+        
+        return results
+    
+    def scrape_establishments(self, establishments: List[dict]) -> List[dict]:
+        """
+        Scrape many establishments concurrently and return the per-establishment review counts
+        (blocking; see scrape_establishments_async)
+        """
+        return asyncio.run(self.scrape_establishments_async(establishments))
+    
     def run_full_scrape(self, excel_path: str):
         """Run complete scraping process"""
         if not self.initialize():
@@ -192,17 +357,7 @@ class ReviewScraper:
             
             self.logger.info(f"Starting scrape for {len(establishments)} establishments")
             
-            results = []
-            for i, establishment in enumerate(establishments, 1):
-                self.logger.info(f"Processing {i}/{len(establishments)}: {establishment['display_name']}")
-                
-                try:
-                    result = self.scrape_establishment_reviews(establishment)
-                    results.append(result)
-                    
-                except Exception as e:
-                    self.logger.error(f"Error scraping {establishment['display_name']}: {e}")
-                    continue
+            results = self.scrape_establishments(establishments)
             
             # Summary
             total_google = sum(r['google_reviews'] for r in results)
@@ -214,6 +369,7 @@ class ReviewScraper:
             self.logger.error(f"Error during scraping process: {e}")
         
         finally:
+            self.apify_client.close()
             self.db_manager.close_connection()
 
 def main():
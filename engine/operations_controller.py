@@ -2,7 +2,11 @@
 import os
 import sys
 import argparse
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -13,6 +17,50 @@ sys.path.append(str(project_root))
 from database.db_manager import DatabaseManager
 from utils.excel_reader import ExcelReader
 from scrapers.apify_client import ApifyClient
+from main_scraper import ReviewScraper
+
+@lru_cache(maxsize=1)
+def _load_tokens_cached():
+    """Read API tokens once per process, preferring environment variables over token files"""
+    # Load MongoDB connection string
+    mongodb_connection = os.environ.get('MONGODB_URI')
+    if not mongodb_connection:
+        with open('tokens/mongodb_connection.txt', 'r') as f:
+            mongodb_connection = f.read().strip()
+    
+    # Load Apify API token
+    apify_token = os.environ.get('APIFY_TOKEN')
+    if not apify_token:
+        with open('tokens/apify_token_dev2.txt', 'r') as f:
+            apify_token = f.read().strip()
+    
+    return mongodb_connection, apify_token
+
+@lru_cache(maxsize=1)
+def _start_log_listener() -> QueueListener:
+    """Route logging through a queue drained by one background thread per process"""
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.FileHandler('operations.log'),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    # Callers only enqueue records; the listener thread does the file and console I/O
+    log_queue = queue.Queue(-1)
+    log_listener = QueueListener(log_queue, *handlers)
+    log_listener.start()
+    # Flush queued records at exit, after every controller's cleanup has logged
+    atexit.register(log_listener.stop)
+    
+    # Records are formatted by the listener's handlers, so only the message is rendered here
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    # force=True replaces the default handler DatabaseManager installs on construction
+    logging.basicConfig(handlers=[queue_handler], force=True)
+    return log_listener
 
 class OperationsController:
     def __init__(self, verbose: bool = False):
@@ -20,33 +68,19 @@ class OperationsController:
         self.db_manager = DatabaseManager()
         self.excel_reader = ExcelReader()
         self.apify_client = None
+        self.scraper = None
         self.logger = self._setup_logging()
     
     def _setup_logging(self):
-        """Setup logging configuration"""
-        level = logging.DEBUG if self.verbose else logging.INFO
-        logging.basicConfig(
-            level=level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('operations.log'),
-                logging.StreamHandler()
-            ]
-        )
+        """Setup logging configuration, writing records from a background thread"""
+        _start_log_listener()
+        logging.getLogger().setLevel(logging.DEBUG if self.verbose else logging.INFO)
         return logging.getLogger(__name__)
     
     def _load_tokens(self):
-        """Load API tokens from files"""
+        """Load API tokens from MONGODB_URI/APIFY_TOKEN or the token files"""
         try:
-            # Load MongoDB connection string
-            with open('tokens/mongodb_connection.txt', 'r') as f:
-                mongodb_connection = f.read().strip()
-            
-            # Load Apify API token
-            with open('tokens/apify_token_dev2.txt', 'r') as f:
-                apify_token = f.read().strip()
-            
-            return mongodb_connection, apify_token
+            return _load_tokens_cached()
             
         except FileNotFoundError as e:
             self.logger.error(f"Token file not found: {e}")
@@ -69,11 +103,21 @@ class OperationsController:
         # Initialize Apify client
         self.apify_client = ApifyClient(apify_token)
         
+        # Scraping itself is shared with main_scraper, reusing this controller's clients
+        self.scraper = ReviewScraper(self.db_manager, self.apify_client)
+        
         self.logger.info("Initialization complete")
         return True
     
-    def scrape_reviews(self, excel_path: str) -> bool:
-        """Scrape reviews from establishments in Excel file"""
+    def scrape_reviews(self, excel_path: str, ttl_hours: float = 0, force: bool = False) -> bool:
+        """
+        Scrape reviews from establishments in Excel file
+        
+        Args:
+            excel_path: Path to the Excel file with establishments
+            ttl_hours: Skip platforms scraped within this many hours (0 scrapes every platform)
+            force: Scrape every platform regardless of when it was last scraped
+        """
         self.logger.info(f"Starting review scraping from: {excel_path}")
         
         if not os.path.exists(excel_path):
@@ -87,80 +131,22 @@ class OperationsController:
                 self.logger.error("No establishments found in Excel file")
                 return False
             
-            # Process each establishment
-            processed_establishments = []
-            for est in establishments:
-                # Check if establishment already exists
-                existing = self.db_manager.get_establishment_by_url(est['google_url'])
-                
-                if existing:
-                    self.logger.info(f"Establishment already exists: {est['display_name']}")
-                    processed_establishments.append({
-                        'id': str(existing['_id']),
-                        'display_name': existing['display_name'],
-                        'google_url': existing['google_url'],
-                        'website': existing['website'],
-                        'existing': True
-                    })
-                else:
-                    # Create new establishment
-                    establishment_id = self.db_manager.create_establishment(
-                        est['display_name'],
-                        est['google_url'],
-                        est['website']
-                    )
-                    processed_establishments.append({
-                        'id': establishment_id,
-                        'display_name': est['display_name'],
-                        'google_url': est['google_url'],
-                        'website': est['website'],
-                        'existing': False
-                    })
+            # Match them to database records, creating missing ones, and apply the TTL
+            processed_establishments = self.scraper.resolve_establishments(establishments, ttl_hours, force)
+            
+            processed_establishments = [
+                establishment for establishment in processed_establishments
+                if len(establishment['skip_platforms']) < len(self.scraper.PLATFORMS)
+            ]
+            if not processed_establishments:
+                self.logger.info(f"All establishments were scraped within the last {ttl_hours} hours, nothing to do "
+                               f"(use --force to scrape anyway)")
+                return True
             
             self.logger.info(f"Starting scrape for {len(processed_establishments)} establishments")
             
-            # Scrape reviews for each establishment
-            results = []
-            for i, establishment in enumerate(processed_establishments, 1):
-                self.logger.info(f"Processing {i}/{len(processed_establishments)}: {establishment['display_name']}")
-                
-                try:
-                    # Scrape Google reviews
-                    self.logger.info("Scraping Google Maps reviews...")
-                    google_reviews = self.apify_client.scrape_google_reviews(establishment['google_url'])
-                    google_count = self.db_manager.save_google_reviews(establishment['id'], google_reviews)
-                    
-                    # Update establishment with Google scrape info
-                    self.db_manager.update_establishment_scrape_info(
-                        establishment['id'], 
-                        'google', 
-                        google_count
-                    )
-                    
-                    # Scrape Trustpilot reviews
-                    self.logger.info("Scraping Trustpilot reviews...")
-                    trustpilot_reviews = self.apify_client.scrape_trustpilot_reviews(establishment['website'])
-                    trustpilot_count = self.db_manager.save_trustpilot_reviews(establishment['id'], trustpilot_reviews)
-                    
-                    # Update establishment with Trustpilot scrape info
-                    self.db_manager.update_establishment_scrape_info(
-                        establishment['id'], 
-                        'trustpilot', 
-                        trustpilot_count
-                    )
-                    
-                    results.append({
-                        'establishment_id': establishment['id'],
-                        'google_reviews': google_count,
-                        'trustpilot_reviews': trustpilot_count
-                    })
-                    
-                    self.logger.info(f"Completed scraping for {establishment['display_name']}: "
-                                   f"Google={google_count}, Trustpilot={trustpilot_count}")
-                    
-                except Exception as e:
-                    self.logger.error(f"Error scraping {establishment['display_name']}: {e}")
-                    continue
+            # Scrape establishments concurrently (scraping.concurrency in config.yaml)
+            results = self.scraper.scrape_establishments(processed_establishments)
             
             # Summary
             total_google = sum(r['google_reviews'] for r in results)
@@ -201,6 +187,7 @@ class OperationsController:
         
         try:
             # Create indexes if they don't exist
+            self.db_manager.create_unified_reviews_indexes()
             self.db_manager.create_ls_unified_reviews_indexes()
             
             # Run incremental standardization
@@ -228,10 +215,10 @@ class OperationsController:
             # Language standardized reviews stats
             ls_stats = self.db_manager.get_ls_unified_reviews_stats()
             
-            # Raw collection stats
-            google_count = self.db_manager.db.google.count_documents({})
-            trustpilot_count = self.db_manager.db.trustpilot.count_documents({})
-            establishments_count = self.db_manager.db.establishments.count_documents({})
+            # Raw collection stats (unfiltered, so collection metadata counts are enough)
+            google_count = self.db_manager.db.google.estimated_document_count()
+            trustpilot_count = self.db_manager.db.trustpilot.estimated_document_count()
+            establishments_count = self.db_manager.db.establishments.estimated_document_count()
             
             print("\n" + "="*60)
             print("DATABASE STATISTICS")
@@ -275,12 +262,13 @@ class OperationsController:
             self.logger.error(f"Error fetching statistics: {e}")
             return False
     
-    def scrape_and_unify(self, excel_path: str, quick_unify: bool = False) -> bool:
+    def scrape_and_unify(self, excel_path: str, quick_unify: bool = False,
+                         ttl_hours: float = 0, force: bool = False) -> bool:
         """Combined operation: scrape reviews then unify them"""
         self.logger.info("Starting scrape and unify operation...")
         
         # First scrape
-        if not self.scrape_reviews(excel_path):
+        if not self.scrape_reviews(excel_path, ttl_hours, force):
             self.logger.error("Scraping failed, aborting unification")
             return False
         
@@ -292,12 +280,13 @@ class OperationsController:
         self.logger.info("Scrape and unify operation completed successfully")
         return True
     
-    def scrape_unify_and_standardize(self, excel_path: str, quick_unify: bool = False, quick_standardize: bool = False) -> bool:
+    def scrape_unify_and_standardize(self, excel_path: str, quick_unify: bool = False, quick_standardize: bool = False,
+                                     ttl_hours: float = 0, force: bool = False) -> bool:
         """Combined operation: scrape reviews, unify them, then standardize them"""
         self.logger.info("Starting scrape, unify, and standardize operation...")
         
         # First scrape
-        if not self.scrape_reviews(excel_path):
+        if not self.scrape_reviews(excel_path, ttl_hours, force):
             self.logger.error("Scraping failed, aborting remaining operations")
             return False
         
@@ -316,6 +305,8 @@ class OperationsController:
     
     def cleanup(self):
         """Clean up resources"""
+        if self.apify_client:
+            self.apify_client.close()
         if self.db_manager:
             self.db_manager.close_connection()
 
@@ -328,6 +319,8 @@ def main():
     # Scrape command
     scrape_parser = subparsers.add_parser('scrape', help='Scrape reviews from establishments')
     scrape_parser.add_argument('--excel', required=True, help='Path to Excel file with establishments')
+    scrape_parser.add_argument('--ttl', type=float, default=0, help='Skip platforms scraped within this many hours (default: 0, always scrape)')
+    scrape_parser.add_argument('--force', action='store_true', help='Scrape all establishments regardless of --ttl')
     
     # Unify command
     unify_parser = subparsers.add_parser('unify', help='Unify reviews from raw collections')
@@ -346,11 +339,15 @@ def main():
     combined_parser = subparsers.add_parser('scrape-and-unify', help='Scrape reviews then unify them')
     combined_parser.add_argument('--excel', required=True, help='Path to Excel file with establishments')
     combined_parser.add_argument('--quick-unify', action='store_true', help='Use quick mode for unification')
+    combined_parser.add_argument('--ttl', type=float, default=0, help='Skip platforms scraped within this many hours (default: 0, always scrape)')
+    combined_parser.add_argument('--force', action='store_true', help='Scrape all establishments regardless of --ttl')
     
     full_pipeline_parser = subparsers.add_parser('full-pipeline', help='Scrape, unify, and standardize reviews')
     full_pipeline_parser.add_argument('--excel', required=True, help='Path to Excel file with establishments')
     full_pipeline_parser.add_argument('--quick-unify', action='store_true', help='Use quick mode for unification')
     full_pipeline_parser.add_argument('--quick-standardize', action='store_true', help='Use quick mode for standardization')
+    full_pipeline_parser.add_argument('--ttl', type=float, default=0, help='Skip platforms scraped within this many hours (default: 0, always scrape)')
+    full_pipeline_parser.add_argument('--force', action='store_true', help='Scrape all establishments regardless of --ttl')
     
     args = parser.parse_args()
     
@@ -369,31 +366,33 @@ def main():
         success = False
         
         if args.command == 'scrape':
-            success = controller.scrape_reviews(args.excel)
+            success = controller.scrape_reviews(args.excel, args.ttl, args.force)
         
         elif args.command == 'unify':
             establishment_ids = None
             if args.establishments:
-                establishment_ids = [id.strip() for id in args.establishments.split(',')]
+                establishment_ids = list(map(str.strip, args.establishments.split(',')))
             success = controller.unify_reviews(establishment_ids, args.quick)
         
         elif args.command == 'standardize':
             establishment_ids = None
             if args.establishments:
-                establishment_ids = [id.strip() for id in args.establishments.split(',')]
+                establishment_ids = list(map(str.strip, args.establishments.split(',')))
             success = controller.standardize_reviews(establishment_ids, args.quick)
         
         elif args.command == 'stats':
             success = controller.show_statistics()
         
         elif args.command == 'scrape-and-unify':
-            success = controller.scrape_and_unify(args.excel, args.quick_unify)
+            success = controller.scrape_and_unify(args.excel, args.quick_unify, args.ttl, args.force)
         
         elif args.command == 'full-pipeline':
             success = controller.scrape_unify_and_standardize(
                 args.excel, 
                 args.quick_unify, 
-                args.quick_standardize
+                args.quick_standardize,
+                args.ttl,
+                args.force
             )
         
         if success:
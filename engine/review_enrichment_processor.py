@@ -1,16 +1,27 @@
 
 import os
 import sys
+import asyncio
+import hashlib
 import yaml
 import json
 import logging
+import random
+import re
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Literal, Annotated, Union
 from datetime import datetime
 from dateutil.parser import parse as parse_date
 from pymongo import MongoClient
-from bson import ObjectId
 import google.generativeai as genai
+from google.api_core.exceptions import ResourceExhausted
+import diskcache
+import msgspec
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
@@ -18,12 +29,73 @@ sys.path.append(str(project_root))
 
 from database.db_manager import DatabaseManager
 
+# Markdown code fence (optionally ```json) wrapped around a model response
+MARKDOWN_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```\s*$')
+
+@lru_cache(maxsize=None)
+def _response_type(attribute_names: tuple, max_value: int, allow_bare_value: bool):
+    """msgspec type for {review_id: {attribute: 0..max_value}}, optionally allowing {review_id: 0..max_value}"""
+    value_type = Annotated[int, msgspec.Meta(ge=0, le=max_value)]
+    attributes_type = Dict[Literal[attribute_names], value_type]
+    if allow_bare_value:
+        return Dict[str, Union[value_type, attributes_type]]
+    return Dict[str, attributes_type]
+
+@lru_cache(maxsize=None)
+def _attributes_struct(attribute_ranges: tuple):
+    """msgspec Struct with an optional 0..max_value int field per (attribute, max_value) pair"""
+    return msgspec.defstruct(
+        'EnrichmentAttributes',
+        [(name, Optional[Annotated[int, msgspec.Meta(ge=0, le=max_value)]], None) for name, max_value in attribute_ranges],
+        forbid_unknown_fields=True
+    )
+
+class AsyncRateLimiter:
+    """Token buckets for requests and input tokens per minute, refilled lazily on acquire"""
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.REQUEST_CAPACITY = requests_per_minute
+        self.TOKEN_CAPACITY = tokens_per_minute
+        self.available_requests = float(requests_per_minute)
+        self.available_tokens = float(tokens_per_minute)
+        self.refilled_at = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    def _refill(self):
+        """Add the capacity earned since the last refill"""
+        now = time.monotonic()
+        elapsed_minutes = (now - self.refilled_at) / 60
+        self.available_requests = min(self.REQUEST_CAPACITY, self.available_requests + elapsed_minutes * self.REQUEST_CAPACITY)
+        self.available_tokens = min(self.TOKEN_CAPACITY, self.available_tokens + elapsed_minutes * self.TOKEN_CAPACITY)
+        self.refilled_at = now
+    
+    async def acquire(self, tokens: int):
+        """Wait until one request carrying the given number of input tokens fits both budgets"""
+        # A single prompt larger than the per-minute budget waits for a full bucket
+        tokens = min(tokens, self.TOKEN_CAPACITY)
+        
+        # Waiters queue on the lock, so requests are admitted in arrival order
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    return
+                
+                wait_minutes = max(
+                    (1 - self.available_requests) / self.REQUEST_CAPACITY,
+                    (tokens - self.available_tokens) / self.TOKEN_CAPACITY
+                )
+                await asyncio.sleep(wait_minutes * 60)
+
 class ReviewEnrichmentProcessor:
     def __init__(self, config_path: str = "enrichment_config.yaml"):
         self.config_path = config_path
         self.config = None
         self.db_manager = DatabaseManager()
         self.genai_model = None
+        self.genai_api_key = None
         self.logger = self._setup_logging()
         
         # Token limit management (70% of 1M tokens)
@@ -32,9 +104,22 @@ class ReviewEnrichmentProcessor:
         # Processing thresholds
         self.MIN_REVIEW_LENGTH = 10
         
-        # Load configuration
-        self._load_config()
-        self._setup_genai()
+        # Upserts per unordered bulk write, and how many of those writes run at once
+        self.UPSERT_CHUNK_SIZE = 1000
+        self.UPSERT_WORKERS = 4
+        
+        # Exact-match cache of parsed Gemini responses, shared across runs
+        self.RESPONSE_CACHE_TTL = 7 * 24 * 60 * 60
+        self.response_cache = None
+        
+        # Review fields used by prompts and enriched_reviews documents
+        self.REVIEW_PROJECTION = {
+            '_id': 1, 'establishment_id': 1, 'platform': 1, 'published_at_date': 1,
+            'title': 1, 'review_text': 1, 'response_from_owner_text': 1
+        }
+        
+        # Configuration, Gemini and the response cache are set up in initialize(),
+        # so read-only uses such as get_processing_stats only open a database connection
     
     def _setup_logging(self):
         """Setup logging configuration"""
@@ -59,6 +144,9 @@ class ReviewEnrichmentProcessor:
             self._create_default_config()
             with open(self.config_path, 'r') as f:
                 self.config = yaml.safe_load(f)
+        
+        # Read once here rather than on every batch loop
+        self.batch_size = self.config['processing']['batch_size']
     
     def _create_default_config(self):
         """Create default configuration file"""
@@ -120,9 +208,15 @@ class ReviewEnrichmentProcessor:
                 }
             },
             'processing': {
-                'batch_size': 30,
+                'batch_size': 150,
+                'max_prompt_tokens': 20000,
                 'sentiment_batch_size': 3,
-                'max_retries': 3
+                'max_retries': 3,
+                'max_concurrent': 8,
+                'requests_per_minute': 60,
+                'tokens_per_minute': 100000,
+                'use_batch_api': False,
+                'batch_poll_interval': 60
             }
         }
         
@@ -137,6 +231,7 @@ class ReviewEnrichmentProcessor:
             with open('tokens/google_api_key.txt', 'r') as f:
                 api_key = f.read().strip()
             genai.configure(api_key=api_key)
+            self.genai_api_key = api_key
             self.genai_model = genai.GenerativeModel('gemini-2.5-flash')
             self.logger.info("Google Generative AI configured successfully")
         except FileNotFoundError:
@@ -153,17 +248,25 @@ class ReviewEnrichmentProcessor:
             self.logger.error("MongoDB connection file not found")
             return None
     
-    def initialize(self):
-        """Initialize database connection"""
+    def connect(self):
+        """Open the database connection only"""
         mongodb_connection = self._load_tokens()
         if not mongodb_connection:
             return False
         
-        if not self.db_manager.connect(mongodb_connection):
+        return self.db_manager.connect(mongodb_connection)
+    
+    def initialize(self):
+        """Initialize database connection, configuration and Gemini for processing"""
+        if not self.connect():
             return False
         
         # Create enriched_reviews collection indexes
         self._create_enriched_reviews_indexes()
+        
+        self._load_config()
+        self._setup_genai()
+        self.response_cache = diskcache.Cache('.gemini_cache')
         return True
     
     def _create_enriched_reviews_indexes(self):
@@ -208,16 +311,45 @@ class ReviewEnrichmentProcessor:
             if parsed_date:
                 query["published_at_date"] = {"$gte": parsed_date.isoformat()}
         
-        # Get reviews from ls_unified_reviews
-        reviews = list(self.db_manager.db.ls_unified_reviews.find(query))
+        # Drop short reviews on the server; the exact (stripped) length is checked below.
+        # _get_review_content_length joins title and review_text with a space, so allow one
+        # character less here to keep this a superset of what the exact check accepts
+        query["$expr"] = {
+            "$gte": [
+                {"$add": [
+                    {"$strLenCP": {"$ifNull": ["$title", ""]}},
+                    {"$strLenCP": {"$ifNull": ["$review_text", ""]}}
+                ]},
+                self.MIN_REVIEW_LENGTH - 1
+            ]
+        }
         
+        # Get projected reviews from ls_unified_reviews
+        ls_reviews = self.db_manager.db.ls_unified_reviews
         if incremental:
-            # Filter out already processed reviews
-            processed_ids = set(self.db_manager.db.enriched_reviews.distinct("_id"))
-            reviews = [r for r in reviews if r["_id"] not in processed_ids]
+            # Filter out already processed reviews with a server-side anti-join on enriched_reviews
+            # ($lookup with both localField and pipeline requires MongoDB 5.0+)
+            cursor = ls_reviews.aggregate([
+                {"$match": query},
+                {"$lookup": {
+                    "from": "enriched_reviews",
+                    "localField": "_id",
+                    "foreignField": "_id",
+                    "pipeline": [{"$project": {"_id": 1}}],
+                    "as": "_enriched"
+                }},
+                {"$match": {"_enriched": {"$size": 0}}},
+                {"$project": self.REVIEW_PROJECTION}
+            ], allowDiskUse=True, batchSize=1000)
+        else:
+            cursor = ls_reviews.find(query, self.REVIEW_PROJECTION).batch_size(1000)
         
-        # Filter by minimum length
-        reviews = [r for r in reviews if self._get_review_content_length(r) >= self.MIN_REVIEW_LENGTH]
+        reviews = list(cursor)
+        
+        # Filter by minimum length, keeping the length for the review_length field
+        for r in reviews:
+            r['_content_length'] = self._get_review_content_length(r)
+        reviews = [r for r in reviews if r['_content_length'] >= self.MIN_REVIEW_LENGTH]
         
         self.logger.info(f"Found {len(reviews)} reviews to process")
         return reviews
@@ -234,7 +366,9 @@ class ReviewEnrichmentProcessor:
     def _calculate_basic_fields(self, review: Dict) -> Dict:
         """Calculate has_response and review_length fields"""
         has_response = 1 if review.get('response_from_owner_text') else 0
-        review_length = self._get_review_content_length(review)
+        review_length = review.get('_content_length')
+        if review_length is None:
+            review_length = self._get_review_content_length(review)
         
         return {
             'has_response': has_response,
@@ -249,42 +383,70 @@ class ReviewEnrichmentProcessor:
         for attr_name, attr_config in attributes.items():
             attrs_list.append(f"{attr_name}: {attr_config['description']}")
         
-        prompt = f"""Analyze sentiment for: {', '.join(attrs_list)}
+        parts = [f"""Analyze sentiment for: {', '.join(attrs_list)}
 
 Scale: 0=not mentioned, 1=negative, 2=neutral/mixed, 3=positive
 
 Return JSON: {{"review_id": {{{', '.join(f'"{attr}": 0' for attr in attributes.keys())}}}}}
 
 Reviews:
-"""
+"""]
         
         for review in reviews:
             review_id = str(review['_id'])
             title = review.get('title', '') or ''
             text = review.get('review_text', '') or ''
             content = f"{title} {text}".strip()
-            prompt += f"{review_id}: {content}\n"
+            parts.append(f"{review_id}: {content}\n")
         
-        return prompt
+        return "".join(parts)
     
     def _build_complaint_prompt(self, reviews: List[Dict]) -> str:
         """Build prompt for complaint classification"""
         
-        prompt = """Classify reviews as complaint (1) or not (0).
+        parts = ["""Classify reviews as complaint (1) or not (0).
 
 Return JSON: {"review_id": 0}
 
 Reviews:
-"""
+"""]
+        
+        for review in reviews:
+            review_id = str(review['_id'])
+            title = review.get('title', '') or ''
+            text = review.get('review_text', '') or ''
+            content = f"{title} {text}".strip()
+            parts.append(f"{review_id}: {content}\n")
+        
+        return "".join(parts)
+    
+    def _build_combined_prompt(self, reviews: List[Dict], attributes: Dict) -> str:
+        """Build prompt for sentiment analysis and complaint classification in one call"""
+        
+        # Concise attributes list
+        attrs_list = []
+        for attr_name, attr_config in attributes.items():
+            attrs_list.append(f"{attr_name}: {attr_config['description']}")
+        
+        parts = [f"""Analyze sentiment for: {', '.join(attrs_list)}
+
+Scale: 0=not mentioned, 1=negative, 2=neutral/mixed, 3=positive
+
+Also classify each review as complaint (is_complaint: 1) or not (0).
+
+Return JSON: {{"review_id": {{{', '.join(f'"{attr}": 0' for attr in attributes.keys())}, "is_complaint": 0}}}}
+
+Reviews:
+"""]
         
         for review in reviews:
             review_id = str(review['_id'])
             title = review.get('title', '') or ''
             text = review.get('review_text', '') or ''
             content = f"{title} {text}".strip()
-            prompt += f"{review_id}: {content}\n"
+            parts.append(f"{review_id}: {content}\n")
         
-        return prompt
+        return "".join(parts)
     
     def _build_response_prompt(self, reviews: List[Dict], attributes: Dict) -> str:
         """Build prompt for response analysis"""
@@ -294,12 +456,12 @@ Reviews:
         for attr_name, attr_config in attributes.items():
             attrs_list.append(f"{attr_name}: {attr_config['description']}")
         
-        prompt = f"""Analyze owner responses for: {', '.join(attrs_list)}
+        parts = [f"""Analyze owner responses for: {', '.join(attrs_list)}
 
 Return JSON: {{"review_id": {{{', '.join(f'"{attr}": 0' for attr in attributes.keys())}}}}}
 
 Review + Response pairs:
-"""
+"""]
         
         for review in reviews:
             review_id = str(review['_id'])
@@ -308,16 +470,44 @@ Review + Response pairs:
             response = review.get('response_from_owner_text', '') or ''
             
             review_content = f"{title} {text}".strip()
-            prompt += f"{review_id}:\nReview: {review_content}\nResponse: {response}\n\n"
+            parts.append(f"{review_id}:\nReview: {review_content}\nResponse: {response}\n\n")
         
-        return prompt
+        return "".join(parts)
     
     def _estimate_token_count(self, text: str) -> int:
         """Rough estimation of token count (1 token ≈ 4 characters)"""
         return len(text) // 4
     
-    def _call_gemini_batch(self, prompt: str) -> Dict:
-        """Call Gemini API with error handling"""
+    def _pack_review_batches(self, reviews: List[Dict], include_response: bool = False) -> List[List[Dict]]:
+        """
+        Greedily group reviews into prompt batches whose estimated tokens stay within
+        processing.max_prompt_tokens. batch_size only caps the reviews per batch so the
+        response (one result per review) fits the model's output limit
+        """
+        token_budget = min(self.MAX_TOKENS, self.config['processing'].get('max_prompt_tokens', 20000))
+        
+        batches = []
+        batch, used_tokens = [], 0
+        for review in reviews:
+            text_length = len(review.get('title') or '') + len(review.get('review_text') or '')
+            if include_response:
+                text_length += len(review.get('response_from_owner_text') or '')
+            # Same 4 characters per token estimate, plus the review ID and separators
+            review_tokens = text_length // 4 + 20
+            
+            if batch and (len(batch) >= self.batch_size or used_tokens + review_tokens > token_budget):
+                batches.append(batch)
+                batch, used_tokens = [], 0
+            
+            batch.append(review)
+            used_tokens += review_tokens
+        
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    async def _call_gemini_batch_async(self, prompt: str) -> Dict:
+        """Call Gemini API without blocking the event loop, with error handling"""
         try:
             # Check token limit
             estimated_tokens = self._estimate_token_count(prompt)
@@ -325,54 +515,194 @@ Review + Response pairs:
                 self.logger.warning(f"Prompt too long ({estimated_tokens} tokens), skipping batch")
                 return {}
             
-            response = self.genai_model.generate_content(prompt)
+            # Stay under the quota, and back off when Gemini still reports it exhausted
+            max_retries = self.config['processing'].get('max_retries', 3)
+            for attempt in range(max_retries + 1):
+                await self._rate_limiter.acquire(estimated_tokens)
+                try:
+                    response = await self._generate_content(prompt)
+                    break
+                except ResourceExhausted:
+                    if attempt == max_retries:
+                        raise
+                    delay = 2 ** attempt + random.random()
+                    self.logger.warning(f"Gemini quota exhausted, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+                    await asyncio.sleep(delay)
             
-            if not response or not response.text:
-                self.logger.error("Empty response from Gemini")
-                return {}
+            return self._parse_gemini_response(response.text if response else None)
+                
+        except Exception as e:
+            self.logger.error(f"Gemini API call failed: {e}")
+            return {}
+    
+    async def _generate_content(self, prompt: str):
+        """Send one prompt, in a worker thread for SDK versions without generate_content_async"""
+        if hasattr(self.genai_model, 'generate_content_async'):
+            return await self.genai_model.generate_content_async(prompt)
+        return await asyncio.to_thread(self.genai_model.generate_content, prompt)
+    
+    def _response_cache_key(self, prompt: str) -> str:
+        """Cache key for a prompt sent to the configured model"""
+        return hashlib.sha256(f"{self.genai_model.model_name}\n{prompt}".encode('utf-8')).hexdigest()
+    
+    async def _call_gemini_batches(self, prompts: List[str]) -> List[Dict]:
+        """Get parsed Gemini responses for prompts, only calling the API for cache misses"""
+        cache_keys = [self._response_cache_key(prompt) for prompt in prompts]
+        results = [self.response_cache.get(key) for key in cache_keys]
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        if len(missing) < len(prompts):
+            self.logger.info(f"Served {len(prompts) - len(missing)} of {len(prompts)} prompts from the response cache")
+        
+        if missing:
+            fetched = await self._send_gemini_prompts([prompts[i] for i in missing])
+            for i, result in zip(missing, fetched):
+                results[i] = result
+                # Only cache usable responses so failed batches are retried next run
+                if result:
+                    self.response_cache.set(cache_keys[i], result, expire=self.RESPONSE_CACHE_TTL)
+        
+        return results
+    
+    async def _send_gemini_prompts(self, prompts: List[str]) -> List[Dict]:
+        """Call Gemini for many prompts concurrently, bounded by processing.max_concurrent"""
+        if self.config['processing'].get('use_batch_api', False):
+            # Offline mode: one Batch API job per call, polled in a worker thread
+            return await asyncio.to_thread(self._call_gemini_batch_api, prompts)
+        
+        async def call_bounded(prompt: str) -> Dict:
+            async with self._gemini_semaphore:
+                return await self._call_gemini_batch_async(prompt)
+        
+        return await asyncio.gather(*(call_bounded(prompt) for prompt in prompts))
+    
+    def _call_gemini_batch_api(self, prompts: List[str]) -> List[Dict]:
+        """
+        Submit prompts as a single Gemini Batch API job and wait for it to finish.
+        Batch jobs are billed at a discount but may take up to 24 hours.
+        
+        Returns:
+            Parsed responses in the same order as prompts ({} for failed prompts)
+        """
+        from google import genai as genai_client
+        
+        results = [{} for _ in prompts]
+        requests = []
+        for i, prompt in enumerate(prompts):
+            estimated_tokens = self._estimate_token_count(prompt)
+            if estimated_tokens > self.MAX_TOKENS:
+                self.logger.warning(f"Prompt too long ({estimated_tokens} tokens), skipping batch")
+                continue
+            requests.append({"key": str(i), "request": {"contents": [{"parts": [{"text": prompt}]}]}})
+        
+        if not requests:
+            return results
+        
+        try:
+            client = genai_client.Client(api_key=self.genai_api_key)
             
-            # Clean and parse JSON response
+            # Upload the requests as a JSONL file
+            with tempfile.NamedTemporaryFile('wb', suffix='.jsonl', delete=False) as f:
+                for request in requests:
+                    f.write(msgspec.json.encode(request) + b"\n")
+                jsonl_path = f.name
             try:
-                response_text = response.text.strip()
-                
-                # Remove markdown code blocks if present
-                if response_text.startswith('```json'):
-                    response_text = response_text[7:]  # Remove ```json
-                elif response_text.startswith('```'):
-                    response_text = response_text[3:]   # Remove ```
-                
-                if response_text.endswith('```'):
-                    response_text = response_text[:-3]  # Remove trailing ```
-                
-                response_text = response_text.strip()
-                
-                # Parse JSON
-                result = json.loads(response_text)
-                return result
-                
-            except json.JSONDecodeError as e:
-                self.logger.error(f"Failed to parse Gemini response as JSON: {e}")
-                self.logger.error(f"Raw response: {response.text[:500]}...")
-                
-                # Try to extract JSON from the response using regex as fallback
-                import re
-                json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
-                if json_match:
-                    try:
-                        result = json.loads(json_match.group())
-                        self.logger.info("Successfully extracted JSON using regex fallback")
-                        return result
-                    except json.JSONDecodeError:
-                        pass
+                uploaded_file = client.files.upload(file=jsonl_path, config={'mime_type': 'jsonl'})
+            finally:
+                os.remove(jsonl_path)
+            
+            batch_job = client.batches.create(
+                model=self.genai_model.model_name,
+                src=uploaded_file.name,
+                config={'display_name': 'review-enrichment'}
+            )
+            self.logger.info(f"Submitted Gemini batch job {batch_job.name} with {len(requests)} prompts")
+            
+            # Poll until the job reaches a terminal state
+            poll_interval = self.config['processing'].get('batch_poll_interval', 60)
+            terminal_states = {'JOB_STATE_SUCCEEDED', 'JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED'}
+            while batch_job.state.name not in terminal_states:
+                time.sleep(poll_interval)
+                batch_job = client.batches.get(name=batch_job.name)
+            
+            if batch_job.state.name != 'JOB_STATE_SUCCEEDED':
+                self.logger.error(f"Gemini batch job {batch_job.name} ended with state {batch_job.state.name}")
+                return results
+            
+            # Results come back as JSONL keyed by the request key
+            output = client.files.download(file=batch_job.dest.file_name)
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
                 
-                return {}
+                item = msgspec.json.decode(line)
+                try:
+                    parts = item['response']['candidates'][0]['content']['parts']
+                except (KeyError, IndexError, TypeError):
+                    self.logger.error(f"Gemini batch request {item.get('key')} failed: {str(item.get('error', item))[:200]}")
+                    continue
                 
+                response_text = "".join(part.get('text', '') for part in parts)
+                results[int(item['key'])] = self._parse_gemini_response(response_text)
+            
         except Exception as e:
-            self.logger.error(f"Gemini API call failed: {e}")
+            self.logger.error(f"Gemini batch job failed: {e}")
+        
+        return results
+    
+    def _parse_gemini_response(self, response_text: Optional[str]) -> Dict:
+        """Parse the JSON payload out of Gemini response text"""
+        if not response_text:
+            self.logger.error("Empty response from Gemini")
             return {}
+        
+        raw_text = response_text
+        
+        # Clean and parse JSON response
+        try:
+            # Remove markdown code blocks if present
+            response_text = MARKDOWN_FENCE_RE.sub('', response_text.strip()).strip()
+            
+            # Parse JSON
+            result = msgspec.json.decode(response_text)
+            return result
+            
+        except msgspec.DecodeError as e:
+            self.logger.error(f"Failed to parse Gemini response as JSON: {e}")
+            self.logger.error(f"Raw response: {raw_text[:500]}...")
+            
+            # Fall back to the first JSON object embedded in the surrounding text
+            result = self._extract_json_object(raw_text)
+            if result is not None:
+                self.logger.info("Successfully extracted embedded JSON object")
+                return result
+            
+            return {}
+    
+    def _extract_json_object(self, text: str) -> Optional[Dict]:
+        """Decode the first JSON object found in text, trying each opening brace in turn"""
+        decoder = json.JSONDecoder()
+        start = text.find('{')
+        while start != -1:
+            try:
+                result, _ = decoder.raw_decode(text, start)
+                if isinstance(result, dict):
+                    return result
+            except json.JSONDecodeError:
+                pass
+            start = text.find('{', start + 1)
+        return None
     
     def _validate_sentiment_response(self, response_data: Dict, expected_attributes: Set[str]) -> Dict:
         """Validate sentiment analysis response format"""
+        # Fast path: well-formed responses validate in one msgspec pass
+        try:
+            converted = msgspec.convert(response_data, _response_type(tuple(sorted(expected_attributes)), 3, False))
+            return {review_id: attributes for review_id, attributes in converted.items() if attributes}
+        except msgspec.ValidationError:
+            pass
+        
+        # Slow path keeps the valid parts of a malformed response and logs the rest
         validated_data = {}
         
         if not isinstance(response_data, dict):
@@ -398,6 +728,24 @@ Review + Response pairs:
     
     def _validate_binary_response(self, response_data: Dict, expected_attributes: Set[str]) -> Dict:
         """Validate binary classification response format"""
+        # Fast path: well-formed responses validate in one msgspec pass
+        allow_bare_value = 'is_complaint' in expected_attributes
+        try:
+            converted = msgspec.convert(
+                response_data, _response_type(tuple(sorted(expected_attributes)), 1, allow_bare_value)
+            )
+            validated_data = {}
+            for review_id, attributes in converted.items():
+                if isinstance(attributes, int):
+                    # Complaint responses carry a single integer per review
+                    validated_data[review_id] = {'is_complaint': attributes}
+                elif attributes:
+                    validated_data[review_id] = attributes
+            return validated_data
+        except msgspec.ValidationError:
+            pass
+        
+        # Slow path keeps the valid parts of a malformed response and logs the rest
         validated_data = {}
         
         if not isinstance(response_data, dict):
@@ -425,96 +773,175 @@ Review + Response pairs:
         
         return validated_data
     
-    def _process_sentiment_attributes(self, reviews: List[Dict], attributes: Dict) -> Dict:
+    def _validate_combined_response(self, response_data: Dict, attribute_ranges: Dict[str, int]) -> Dict:
+        """
+        Validate a response mixing attributes with different scales
+        
+        Args:
+            response_data: Parsed Gemini response
+            attribute_ranges: Maximum allowed value per expected attribute (e.g. 3 for sentiment, 1 for is_complaint)
+        """
+        # Fast path: well-formed responses validate in one msgspec pass
+        attributes_struct = _attributes_struct(tuple(sorted(attribute_ranges.items())))
+        try:
+            converted = msgspec.convert(response_data, Dict[str, attributes_struct])
+            validated_data = {}
+            for review_id, attributes in converted.items():
+                validated_attributes = {
+                    attr_name: value for attr_name in attributes.__struct_fields__
+                    if (value := getattr(attributes, attr_name)) is not None
+                }
+                if validated_attributes:
+                    validated_data[review_id] = validated_attributes
+            return validated_data
+        except msgspec.ValidationError:
+            pass
+        
+        # Slow path keeps the valid parts of a malformed response and logs the rest
+        validated_data = {}
+        
+        if not isinstance(response_data, dict):
+            self.logger.warning("Response data is not a dictionary")
+            return validated_data
+        
+        for review_id, attributes in response_data.items():
+            if not isinstance(attributes, dict):
+                self.logger.warning(f"Invalid format for review {review_id}: expected dict, got {type(attributes)}")
+                continue
+            
+            validated_attributes = {}
+            for attr_name, value in attributes.items():
+                max_value = attribute_ranges.get(attr_name)
+                if max_value is not None and isinstance(value, int) and 0 <= value <= max_value:
+                    validated_attributes[attr_name] = value
+                else:
+                    self.logger.warning(f"Invalid attribute {attr_name}={value} for review {review_id}")
+            
+            if validated_attributes:
+                validated_data[review_id] = validated_attributes
+        
+        return validated_data
+    
+    async def _process_sentiment_attributes(self, reviews: List[Dict], attributes: Dict) -> Dict:
         """Process sentiment attributes (0-3 scale)"""
-        batch_size = self.config['processing']['batch_size']
-        enrichment_data = {}
+        enrichment_data = defaultdict(dict)
         
         self.logger.info(f"Processing {len(attributes)} sentiment attributes for {len(reviews)} reviews")
         
-        # Process reviews in batches
-        for i in range(0, len(reviews), batch_size):
-            batch = reviews[i:i + batch_size]
-            self.logger.info(f"Processing sentiment batch {i//batch_size + 1}: reviews {i+1}-{min(i+batch_size, len(reviews))}")
-            
-            prompt = self._build_sentiment_prompt(batch, attributes)
-            response_data = self._call_gemini_batch(prompt)
+        # Build every batch prompt up front and send them concurrently
+        prompts = []
+        start = 0
+        for batch_number, batch in enumerate(self._pack_review_batches(reviews), 1):
+            self.logger.info(f"Processing sentiment batch {batch_number}: reviews {start + 1}-{start + len(batch)}")
+            prompts.append(self._build_sentiment_prompt(batch, attributes))
+            start += len(batch)
+        
+        expected_attributes = set(attributes)
+        for response_data in await self._call_gemini_batches(prompts):
+            if response_data:
+                self._merge_enrichment(enrichment_data, self._validate_sentiment_response(response_data, expected_attributes))
             
+        return enrichment_data
+    
+    async def _process_combined(self, reviews: List[Dict], attributes: Dict) -> Dict:
+        """Process sentiment attributes (0-3 scale) and complaint classification with shared prompts"""
+        enrichment_data = defaultdict(dict)
+        
+        self.logger.info(f"Processing {len(attributes)} sentiment attributes with complaint classification for {len(reviews)} reviews")
+        
+        # Build every batch prompt up front and send them concurrently
+        prompts = []
+        start = 0
+        for batch_number, batch in enumerate(self._pack_review_batches(reviews), 1):
+            self.logger.info(f"Processing combined batch {batch_number}: reviews {start + 1}-{start + len(batch)}")
+            prompts.append(self._build_combined_prompt(batch, attributes))
+            start += len(batch)
+        
+        attribute_ranges = {attr_name: 3 for attr_name in attributes}
+        attribute_ranges['is_complaint'] = 1
+        for response_data in await self._call_gemini_batches(prompts):
             if response_data:
-                validated_data = self._validate_sentiment_response(response_data, set(attributes.keys()))
-                
-                for review_id, attr_data in validated_data.items():
-                    if review_id not in enrichment_data:
-                        enrichment_data[review_id] = {}
-                    enrichment_data[review_id].update(attr_data)
+                self._merge_enrichment(enrichment_data, self._validate_combined_response(response_data, attribute_ranges))
             
         return enrichment_data
     
-    def _process_complaint_attribute(self, reviews: List[Dict]) -> Dict:
+    async def _process_complaint_attribute(self, reviews: List[Dict]) -> Dict:
         """Process complaint classification"""
-        batch_size = self.config['processing']['batch_size']
-        enrichment_data = {}
+        enrichment_data = defaultdict(dict)
         
         self.logger.info(f"Processing complaint classification for {len(reviews)} reviews")
         
-        # Process reviews in batches
-        for i in range(0, len(reviews), batch_size):
-            batch = reviews[i:i + batch_size]
-            self.logger.info(f"Processing complaint batch {i//batch_size + 1}: reviews {i+1}-{min(i+batch_size, len(reviews))}")
-            
-            prompt = self._build_complaint_prompt(batch)
-            response_data = self._call_gemini_batch(prompt)
-            
+        # Build every batch prompt up front and send them concurrently
+        prompts = []
+        start = 0
+        for batch_number, batch in enumerate(self._pack_review_batches(reviews), 1):
+            self.logger.info(f"Processing complaint batch {batch_number}: reviews {start + 1}-{start + len(batch)}")
+            prompts.append(self._build_complaint_prompt(batch))
+            start += len(batch)
+        
+        for response_data in await self._call_gemini_batches(prompts):
             if response_data:
-                validated_data = self._validate_binary_response(response_data, {'is_complaint'})
-                
-                for review_id, attr_data in validated_data.items():
-                    if review_id not in enrichment_data:
-                        enrichment_data[review_id] = {}
-                    enrichment_data[review_id].update(attr_data)
+                self._merge_enrichment(enrichment_data, self._validate_binary_response(response_data, {'is_complaint'}))
             
         return enrichment_data
     
-    def _process_response_attributes(self, reviews: List[Dict], attributes: Dict) -> Dict:
-        """Process response-specific attributes"""
+    async def _process_response_attributes(self, reviews: List[Dict], attributes: Dict,
+                                           complaint_map: Dict[str, int]) -> Dict:
+        """
+        Process response-specific attributes
+        
+        Args:
+            reviews: Reviews being processed
+            attributes: Enabled response attributes
+            complaint_map: is_complaint values classified in this run, keyed by review ID string
+        """
         # Filter reviews that have responses and complaints
-        eligible_reviews = []
-        for review in reviews:
-            has_response = review.get('response_from_owner_text')
-            # We need is_complaint to be already processed, so we check enriched_reviews
-            existing_enrichment = self.db_manager.db.enriched_reviews.find_one({"_id": review["_id"]})
-            is_complaint = existing_enrichment.get('is_complaint', 0) if existing_enrichment else 0
-            
-            if has_response and is_complaint == 1:
-                eligible_reviews.append(review)
+        responded_reviews = [review for review in reviews if review.get('response_from_owner_text')]
+        
+        # Reviews not classified in this run fall back to is_complaint stored by earlier runs
+        unclassified_ids = [review["_id"] for review in responded_reviews if str(review["_id"]) not in complaint_map]
+        stored_complaint_ids = {
+            doc["_id"] for doc in self.db_manager.db.enriched_reviews.find(
+                {"_id": {"$in": unclassified_ids}, "is_complaint": 1}, {"_id": 1}
+            )
+        } if unclassified_ids else set()
+        
+        eligible_reviews = [
+            review for review in responded_reviews
+            if complaint_map.get(str(review["_id"])) == 1 or review["_id"] in stored_complaint_ids
+        ]
         
         if not eligible_reviews:
             self.logger.info("No reviews eligible for response attribute analysis")
             return {}
         
-        batch_size = self.config['processing']['batch_size']
-        enrichment_data = {}
+        enrichment_data = defaultdict(dict)
         
         self.logger.info(f"Processing {len(attributes)} response attributes for {len(eligible_reviews)} eligible reviews")
         
-        # Process reviews in batches
-        for i in range(0, len(eligible_reviews), batch_size):
-            batch = eligible_reviews[i:i + batch_size]
-            self.logger.info(f"Processing response batch {i//batch_size + 1}: reviews {i+1}-{min(i+batch_size, len(eligible_reviews))}")
-            
-            prompt = self._build_response_prompt(batch, attributes)
-            response_data = self._call_gemini_batch(prompt)
-            
+        # Build every batch prompt up front and send them concurrently
+        prompts = []
+        start = 0
+        for batch_number, batch in enumerate(self._pack_review_batches(eligible_reviews, include_response=True), 1):
+            self.logger.info(f"Processing response batch {batch_number}: reviews {start + 1}-{start + len(batch)}")
+            prompts.append(self._build_response_prompt(batch, attributes))
+            start += len(batch)
+        
+        expected_attributes = set(attributes)
+        for response_data in await self._call_gemini_batches(prompts):
             if response_data:
-                validated_data = self._validate_binary_response(response_data, set(attributes.keys()))
-                
-                for review_id, attr_data in validated_data.items():
-                    if review_id not in enrichment_data:
-                        enrichment_data[review_id] = {}
-                    enrichment_data[review_id].update(attr_data)
+                self._merge_enrichment(enrichment_data, self._validate_binary_response(response_data, expected_attributes))
             
         return enrichment_data
     
+    def _merge_enrichment(self, enrichment_data: Dict[str, Dict], batch_data: Dict):
+        """Merge per-review attribute dicts from batch_data into enrichment_data (a defaultdict(dict))"""
+        for review_id, attrs in batch_data.items():
+            if isinstance(attrs, dict):
+                enrichment_data[review_id].update(attrs)
+            else:
+                self.logger.warning(f"Invalid attrs format for review {review_id}: {type(attrs)}")
+    
     def _upsert_enriched_reviews(self, enrichment_data: Dict, reviews: List[Dict]):
         """Upsert enrichment data to enriched_reviews collection"""
         if not enrichment_data:
@@ -545,9 +972,9 @@ Review + Response pairs:
                 'updated_at': processed_at
             })
             
-            # Create proper UpdateOne operation
+            # Create proper UpdateOne operation (review['_id'] is already an ObjectId)
             operation = UpdateOne(
-                {'_id': ObjectId(review_id)},
+                {'_id': review['_id']},
                 {'$set': update_data},
                 upsert=True
             )
@@ -555,20 +982,183 @@ Review + Response pairs:
         
         if operations:
             try:
-                result = self.db_manager.db.enriched_reviews.bulk_write(operations)
-                self.logger.info(f"Upserted {result.upserted_count} new and modified {result.modified_count} existing enriched reviews")
+                # Upserts are independent, so unordered chunks can be written in parallel
+                chunks = [
+                    operations[i:i + self.UPSERT_CHUNK_SIZE]
+                    for i in range(0, len(operations), self.UPSERT_CHUNK_SIZE)
+                ]
+                results = {}
+                errors = []
+                with ThreadPoolExecutor(max_workers=self.UPSERT_WORKERS) as executor:
+                    futures = {
+                        executor.submit(self.db_manager.db.enriched_reviews.bulk_write, chunk, ordered=False): chunk_number
+                        for chunk_number, chunk in enumerate(chunks)
+                    }
+                    for future in as_completed(futures):
+                        try:
+                            results[futures[future]] = future.result()
+                        except Exception as e:
+                            errors.append(e)
+                
+                if errors:
+                    # Other chunks (and part of the failed ones) were still written, so the
+                    # incremental counts can't be trusted; let the next run rebuild them
+                    self._clear_platform_counts()
+                    raise errors[0]
+                
+                upserted_count = sum(result.upserted_count for result in results.values())
+                modified_count = sum(result.modified_count for result in results.values())
+                self.logger.info(f"Upserted {upserted_count} new and modified {modified_count} existing enriched reviews")
+                
+                # Only newly inserted documents change the per-platform totals
+                new_by_platform = {}
+                for chunk_number, result in results.items():
+                    offset = chunk_number * self.UPSERT_CHUNK_SIZE
+                    for index in result.upserted_ids:
+                        platform = reviews[offset + index]['platform']
+                        new_by_platform[platform] = new_by_platform.get(platform, 0) + 1
+                self._increment_platform_counts(new_by_platform)
             except Exception as e:
                 self.logger.error(f"Error upserting enriched reviews: {e}")
                 # Log the first few operations for debugging
                 self.logger.error(f"Sample operation: {operations[0]}")
                 raise
     
+    def _increment_platform_counts(self, new_by_platform: Dict[str, int]):
+        """Add newly enriched review counts to the enriched_platform_counts collection"""
+        if not new_by_platform:
+            return
+        
+        from pymongo import UpdateOne
+        
+        try:
+            # Seed from enriched_reviews (which already holds this batch) on first use
+            if self.db_manager.db.enriched_platform_counts.estimated_document_count() == 0:
+                self._rebuild_platform_counts()
+                return
+            
+            self.db_manager.db.enriched_platform_counts.bulk_write([
+                UpdateOne({'_id': platform}, {'$inc': {'count': count}}, upsert=True)
+                for platform, count in new_by_platform.items()
+            ], ordered=False)
+        except Exception as e:
+            self.logger.error(f"Error updating platform counts: {e}")
+            self._clear_platform_counts()
+    
+    def _clear_platform_counts(self):
+        """
+        Drop possibly stale enriched_platform_counts, so the next update or
+        get_processing_stats call rebuilds them from enriched_reviews
+        """
+        try:
+            self.db_manager.db.enriched_platform_counts.delete_many({})
+        except Exception as e:
+            self.logger.error(f"Error clearing stale platform counts: {e}")
+    
+    def _rebuild_platform_counts(self):
+        """Recompute enriched_platform_counts from enriched_reviews"""
+        self.db_manager.db.enriched_reviews.aggregate([
+            {"$match": {"platform": {"$exists": True}}},
+            {"$group": {"_id": "$platform", "count": {"$sum": 1}}},
+            {"$merge": {"into": "enriched_platform_counts", "whenMatched": "replace", "whenNotMatched": "insert"}}
+        ])
+    
+    async def _enrich_reviews(self, reviews: List[Dict], attribute_groups: List[str]):
+        """Run the requested attribute groups over the reviews and upsert the results"""
+        self._gemini_semaphore = asyncio.Semaphore(self.config['processing'].get('max_concurrent', 8))
+        self._rate_limiter = AsyncRateLimiter(
+            self.config['processing'].get('requests_per_minute', 60),
+            self.config['processing'].get('tokens_per_minute', 100000)
+        )
+        
+        enrichment_data = defaultdict(dict)
+        
+        complaint_enabled = (
+            'complaint' in attribute_groups and
+            self.config['complaint_attribute']['is_complaint'].get('enabled', True)
+        )
+        complaint_done = False
+        
+        # Process sentiment attributes
+        if 'sentiment' in attribute_groups:
+            enabled_sentiment_attrs = {
+                name: config for name, config in self.config['sentiment_attributes'].items()
+                if config.get('enabled', True)
+            }
+            
+            if enabled_sentiment_attrs:
+                # Process in smaller batches by attribute group
+                sentiment_batch_size = self.config['processing'].get('sentiment_batch_size', 3)
+                attr_items = list(enabled_sentiment_attrs.items())
+                
+                attr_batches = []
+                for i in range(0, len(attr_items), sentiment_batch_size):
+                    attr_batch = dict(attr_items[i:i + sentiment_batch_size])
+                    
+                    self.logger.info(f"Processing sentiment attributes: {list(attr_batch.keys())}")
+                    attr_batches.append(attr_batch)
+                
+                # Complaint classification rides along with the first attribute group's prompts
+                sentiment_calls = []
+                for i, attr_batch in enumerate(attr_batches):
+                    if i == 0 and complaint_enabled:
+                        self.logger.info("Processing complaint classification with sentiment attributes")
+                        sentiment_calls.append(self._process_combined(reviews, attr_batch))
+                        complaint_done = True
+                    else:
+                        sentiment_calls.append(self._process_sentiment_attributes(reviews, attr_batch))
+                
+                # Attribute groups are independent, so their batches share the concurrency limit
+                sentiment_results = await asyncio.gather(*sentiment_calls)
+                
+                for batch_data in sentiment_results:
+                    self._merge_enrichment(enrichment_data, batch_data)
+        
+        # Process complaint attribute
+        if complaint_enabled and not complaint_done:
+            self.logger.info("Processing complaint classification")
+            complaint_data = await self._process_complaint_attribute(reviews)
+            
+            self._merge_enrichment(enrichment_data, complaint_data)
+        
+        # Process response attributes (requires complaint data to be available)
+        if 'response' in attribute_groups:
+            enabled_response_attrs = {
+                name: config for name, config in self.config['response_attributes'].items()
+                if config.get('enabled', True)
+            }
+            
+            if enabled_response_attrs:
+                self.logger.info("Processing response attributes")
+                complaint_map = {
+                    review_id: attrs['is_complaint'] for review_id, attrs in enrichment_data.items()
+                    if 'is_complaint' in attrs
+                }
+                response_data = await self._process_response_attributes(reviews, enabled_response_attrs, complaint_map)
+                
+                self._merge_enrichment(enrichment_data, response_data)
+        
+        # Final upsert
+        self._upsert_enriched_reviews(enrichment_data, reviews)
+    
     def process_reviews(self, establishment_ids: List[str] = None, 
                        published_after: str = None, 
                        incremental: bool = True,
                        attribute_groups: List[str] = None):
         """
-        Main processing method
+        Main processing method (blocking; use process_reviews_async where an event loop
+        is already running, e.g. in Jupyter)
+        """
+        return asyncio.run(self.process_reviews_async(
+            establishment_ids, published_after, incremental, attribute_groups
+        ))
+    
+    async def process_reviews_async(self, establishment_ids: List[str] = None, 
+                                    published_after: str = None, 
+                                    incremental: bool = True,
+                                    attribute_groups: List[str] = None):
+        """
+        Main processing method, run on the caller's event loop
         
         Args:
             establishment_ids: List of establishment IDs to process
@@ -596,85 +1186,8 @@ Review + Response pairs:
             if 'all' in attribute_groups:
                 attribute_groups = ['sentiment', 'complaint', 'response']
             
-            enrichment_data = {}
-            
-            # Process sentiment attributes
-            if 'sentiment' in attribute_groups:
-                enabled_sentiment_attrs = {
-                    name: config for name, config in self.config['sentiment_attributes'].items()
-                    if config.get('enabled', True)
-                }
-                
-                if enabled_sentiment_attrs:
-                    # Process in smaller batches by attribute group
-                    sentiment_batch_size = self.config['processing'].get('sentiment_batch_size', 3)
-                    attr_names = list(enabled_sentiment_attrs.keys())
-                    
-                    for i in range(0, len(attr_names), sentiment_batch_size):
-                        attr_batch = {name: enabled_sentiment_attrs[name] 
-                                    for name in attr_names[i:i + sentiment_batch_size]}
-                        
-                        self.logger.info(f"Processing sentiment attributes: {list(attr_batch.keys())}")
-                        batch_data = self._process_sentiment_attributes(reviews, attr_batch)
-                        
-                        # Merge results - ensure we're working with dictionaries
-                        if isinstance(batch_data, dict):
-                            for review_id, attrs in batch_data.items():
-                                if review_id not in enrichment_data:
-                                    enrichment_data[review_id] = {}
-                                if isinstance(attrs, dict):
-                                    enrichment_data[review_id].update(attrs)
-                                else:
-                                    self.logger.warning(f"Invalid attrs format for review {review_id}: {type(attrs)}")
-                        else:
-                            self.logger.warning(f"Invalid batch_data format: {type(batch_data)}")
-            
-            # Process complaint attribute
-            if 'complaint' in attribute_groups:
-                if self.config['complaint_attribute']['is_complaint'].get('enabled', True):
-                    self.logger.info("Processing complaint classification")
-                    complaint_data = self._process_complaint_attribute(reviews)
-                    
-                    # Merge results - ensure we're working with dictionaries
-                    if isinstance(complaint_data, dict):
-                        for review_id, attrs in complaint_data.items():
-                            if review_id not in enrichment_data:
-                                enrichment_data[review_id] = {}
-                            if isinstance(attrs, dict):
-                                enrichment_data[review_id].update(attrs)
-                            else:
-                                self.logger.warning(f"Invalid attrs format for review {review_id}: {type(attrs)}")
-                    else:
-                        self.logger.warning(f"Invalid complaint_data format: {type(complaint_data)}")
-            
-            # Upsert current data before processing response attributes
-            self._upsert_enriched_reviews(enrichment_data, reviews)
-            
-            # Process response attributes (requires complaint data to be available)
-            if 'response' in attribute_groups:
-                enabled_response_attrs = {
-                    name: config for name, config in self.config['response_attributes'].items()
-                    if config.get('enabled', True)
-                }
-                
-                if enabled_response_attrs:
-                    self.logger.info("Processing response attributes")
-                    response_data = self._process_response_attributes(reviews, enabled_response_attrs)
-                    
-                    # Merge results - ensure we're working with dictionaries
-                    if isinstance(response_data, dict):
-                        for review_id, attrs in response_data.items():
-                            if review_id not in enrichment_data:
-                                enrichment_data[review_id] = {}
-                            if isinstance(attrs, dict):
-                                enrichment_data[review_id].update(attrs)
-                            else:
-                                self.logger.warning(f"Invalid attrs format for review {review_id}: {type(attrs)}")
-                    else:
-                        self.logger.warning(f"Invalid response_data format: {type(response_data)}")
-            
-            # Final upsert
-            self._upsert_enriched_reviews(enrichment_data, reviews)
+            # One event loop for the whole run; the async Gemini client is bound to it
+            await self._enrich_reviews(reviews, attribute_groups)
             
             self.logger.info("Review enrichment processing completed successfully")
             return True
@@ -684,37 +1197,52 @@ Review + Response pairs:
             return False
         
         finally:
+            if self.response_cache is not None:
+                self.response_cache.close()
             self.db_manager.close_connection()
     
     def get_processing_stats(self) -> Dict:
         """Get statistics about processed reviews"""
+        if self.db_manager.db is None and not self.connect():
+            self.logger.error("Failed to connect to database")
+            return {}
+        
         try:
-            total_ls_reviews = self.db_manager.db.ls_unified_reviews.count_documents({})
-            total_enriched = self.db_manager.db.enriched_reviews.count_documents({})
+            total_ls_reviews = self.db_manager.db.ls_unified_reviews.estimated_document_count()
+            total_enriched = self.db_manager.db.enriched_reviews.estimated_document_count()
             
-            # Platform breakdown
-            platform_pipeline = [
+            # Platform breakdown is maintained at write time; build it once for pre-existing data
+            platform_stats = list(self.db_manager.db.enriched_platform_counts.find())
+            if not platform_stats and total_enriched > 0:
+                self._rebuild_platform_counts()
+                platform_stats = list(self.db_manager.db.enriched_platform_counts.find())
+            
+            # Count unprocessed reviews server-side with an anti-join on the enriched_reviews _id index
+            unprocessed_pipeline = [
+                {"$project": {"_id": 1}},
                 {
-                    "$group": {
-                        "_id": "$platform",
-                        "count": {"$sum": 1}
+                    "$lookup": {
+                        "from": "enriched_reviews",
+                        "localField": "_id",
+                        "foreignField": "_id",
+                        "pipeline": [{"$project": {"_id": 1}}],
+                        "as": "_enriched"
                     }
-                }
+                },
+                {"$match": {"_enriched.0": {"$exists": False}}},
+                {"$count": "unprocessed"}
             ]
-            
-            platform_stats = list(self.db_manager.db.enriched_reviews.aggregate(platform_pipeline))
-            
-            # Find unprocessed reviews
-            enriched_ids = set(self.db_manager.db.enriched_reviews.distinct("_id"))
-            ls_ids = set(self.db_manager.db.ls_unified_reviews.distinct("_id"))
-            unprocessed_count = len(ls_ids - enriched_ids)
+            unprocessed_result = list(self.db_manager.db.ls_unified_reviews.aggregate(unprocessed_pipeline, allowDiskUse=True))
+            unprocessed_count = unprocessed_result[0]["unprocessed"] if unprocessed_result else 0
             
             return {
                 "total_ls_reviews": total_ls_reviews,
                 "total_enriched": total_enriched,
                 "unprocessed_count": unprocessed_count,
                 "platform_breakdown": platform_stats,
-                "processing_coverage": f"{total_enriched}/{total_ls_reviews} ({(total_enriched/total_ls_reviews*100):.1f}%)" if total_ls_reviews > 0 else "0/0 (0%)"
+                # Raw coverage figures; formatting is left to whoever displays them
+                "processing_coverage_num": total_enriched,
+                "processing_coverage_den": total_ls_reviews
             }
             
         except Exception as e:
@@ -739,22 +1267,29 @@ def main():
     
     if args.stats:
         stats = processor.get_processing_stats()
+        processor.db_manager.close_connection()
         print("\n" + "="*60)
         print("REVIEW ENRICHMENT STATISTICS")
         print("="*60)
+        coverage_num = stats.pop("processing_coverage_num", 0)
+        coverage_den = stats.pop("processing_coverage_den", 0)
         for key, value in stats.items():
             print(f"{key}: {value}")
+        if coverage_den > 0:
+            print(f"processing_coverage: {coverage_num}/{coverage_den} ({coverage_num / coverage_den * 100:.1f}%)")
+        else:
+            print("processing_coverage: 0/0 (0%)")
         print("="*60)
         return
     
     # Parse arguments
     establishment_ids = None
     if args.establishments:
-        establishment_ids = [id.strip() for id in args.establishments.split(',')]
+        establishment_ids = list(map(str.strip, args.establishments.split(',')))
     
     attribute_groups = None
     if args.attributes:
-        attribute_groups = [attr.strip() for attr in args.attributes.split(',')]
+        attribute_groups = list(map(str.strip, args.attributes.split(',')))
     
     incremental = not args.no_incremental
     
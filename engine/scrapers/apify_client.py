@@ -1,19 +1,74 @@
 import logging
-from typing import Dict, List, Optional
-from urllib.parse import urlparse
+import re
+from typing import Dict, Iterator, List, Optional
 from apify_client import ApifyClient as ApifyClientSDK
 
+# Host part of a website URL, without scheme or leading www.
+DOMAIN_RE = re.compile(r"^(?:https?://)?(?:www\.)?([^/?#]+)", re.IGNORECASE)
+
 class ApifyClient:
     def __init__(self, api_token: str):
-        self.client = ApifyClientSDK(api_token)
+        # The SDK keeps one pooled HTTP client for all calls; retry transient failures with backoff
+        self.client = ApifyClientSDK(
+            api_token,
+            max_retries=5,
+            min_delay_between_retries_millis=300
+        )
         self.logger = logging.getLogger(__name__)
         
         # Actor IDs
         self.GOOGLE_ACTOR_ID = "Xb8osYTtOjlsgI6k9"
         self.TRUSTPILOT_ACTOR_ID = "fLXimoyuhE1UQgDbM"
+        
+        # Actor resource clients are stateless handles, so build them once
+        self._google_actor = self.client.actor(self.GOOGLE_ACTOR_ID)
+        self._trustpilot_actor = self.client.actor(self.TRUSTPILOT_ACTOR_ID)
+        
+        # Number of dataset items fetched per Apify API request; large pages keep
+        # round trips to a handful per run while bounding memory to one page
+        self.DATASET_PAGE_SIZE = 10000
+    
+    def close(self):
+        """Close the pooled HTTP connections held by the SDK client"""
+        http_client = getattr(self.client, 'http_client', None)
+        httpx_client = getattr(http_client, 'httpx_client', None)
+        if httpx_client is not None:
+            httpx_client.close()
+    
+    def _iter_dataset_pages(self, dataset_id: str) -> Iterator[List[Dict]]:
+        """Page through an Apify dataset with explicit offset/limit requests"""
+        dataset = self.client.dataset(dataset_id)
+        offset = 0
+        
+        while True:
+            page = dataset.list_items(offset=offset, limit=self.DATASET_PAGE_SIZE)
+            if not page.items:
+                return
+            
+            yield page.items
+            offset += len(page.items)
+            if offset >= page.total:
+                return
     
     def scrape_google_reviews(self, google_url: str) -> List[Dict]:
-        """Scrape Google Maps reviews using Apify client"""
+        """Scrape Google Maps reviews using Apify client (errors are logged and yield [])"""
+        try:
+            return list(self.scrape_google_reviews_iter(google_url))
+        except Exception as e:
+            self.logger.error(f"Error scraping Google reviews: {e}")
+            return []
+    
+    def scrape_google_reviews_iter(self, google_url: str) -> Iterator[Dict]:
+        """
+        Scrape Google Maps reviews, yielding processed reviews page by page.
+        Raises if the actor run or a dataset request fails, so callers can tell
+        a failed scrape from one that found no reviews.
+        """
+        run = self._wait_for_run(self._start_google(google_url))
+        yield from self._collect_google(run, google_url)
+    
+    def _start_google(self, google_url: str) -> Dict:
+        """Start the Google Maps actor without waiting for it to finish"""
         self.logger.info(f"Starting Google scrape for: {google_url}")
         
         run_input = {
@@ -23,28 +78,40 @@ class ApifyClient:
             "personalData": False
         }
         
+        return self._google_actor.start(run_input=run_input)
+    
+    def _collect_google(self, run: Dict, google_url: str) -> Iterator[Dict]:
+        """Yield processed reviews from a finished Google Maps actor run"""
+        # Stream results without holding the whole dataset in memory
+        retrieved_count = 0
+        for items in self._iter_dataset_pages(run["defaultDatasetId"]):
+            retrieved_count += len(items)
+            yield from self._process_google_reviews(items, google_url)
+        
+        self.logger.info(f"Retrieved {retrieved_count} Google reviews")
+    
+    def scrape_trustpilot_reviews(self, website: str) -> List[Dict]:
+        """Scrape Trustpilot reviews using Apify client (errors are logged and yield [])"""
         try:
-            # Call the actor
-            run = self.client.actor(self.GOOGLE_ACTOR_ID).call(run_input=run_input)
-            
-            # Get results
-            results = []
-            for item in self.client.dataset(run["defaultDatasetId"]).iterate_items():
-                results.append(item)
-            
-            self.logger.info(f"Retrieved {len(results)} Google reviews")
-            return self._process_google_reviews(results, google_url)
-            
+            return list(self.scrape_trustpilot_reviews_iter(website))
         except Exception as e:
-            self.logger.error(f"Error scraping Google reviews: {e}")
+            self.logger.error(f"Error scraping Trustpilot reviews: {e}")
             return []
     
-    def scrape_trustpilot_reviews(self, website: str) -> List[Dict]:
-        """Scrape Trustpilot reviews using Apify client"""
+    def scrape_trustpilot_reviews_iter(self, website: str) -> Iterator[Dict]:
+        """
+        Scrape Trustpilot reviews, yielding processed reviews page by page.
+        Raises if the actor run or a dataset request fails, so callers can tell
+        a failed scrape from one that found no reviews.
+        """
+        run = self._wait_for_run(self._start_trustpilot(website))
+        yield from self._collect_trustpilot(run, website)
+    
+    def _start_trustpilot(self, website: str) -> Dict:
+        """Start the Trustpilot actor without waiting for it to finish"""
         # Extract domain from website URL
-        domain = urlparse(website).netloc
-        if domain.startswith('www.'):
-            domain = domain[4:]
+        match = DOMAIN_RE.match(website)
+        domain = match.group(1) if match else ''
         
         trustpilot_domain = f"{domain}?languages=all"
         self.logger.info(f"Starting Trustpilot scrape for: {trustpilot_domain}")
@@ -57,71 +124,58 @@ class ApifyClient:
             "verified": False
         }
         
-        try:
-            # Call the actor
-            run = self.client.actor(self.TRUSTPILOT_ACTOR_ID).call(run_input=run_input)
-            
-            # Get results
-            results = []
-            for item in self.client.dataset(run["defaultDatasetId"]).iterate_items():
-                results.append(item)
-            
-            self.logger.info(f"Retrieved {len(results)} Trustpilot reviews")
-            return self._process_trustpilot_reviews(results, website)
-            
-        except Exception as e:
-            self.logger.error(f"Error scraping Trustpilot reviews: {e}")
-            return []
+        return self._trustpilot_actor.start(run_input=run_input)
+    
+    def _collect_trustpilot(self, run: Dict, website: str) -> Iterator[Dict]:
+        """Yield processed reviews from a finished Trustpilot actor run"""
+        # Stream results without holding the whole dataset in memory
+        retrieved_count = 0
+        for items in self._iter_dataset_pages(run["defaultDatasetId"]):
+            retrieved_count += len(items)
+            yield from self._process_trustpilot_reviews(items, website)
+        
+        self.logger.info(f"Retrieved {retrieved_count} Trustpilot reviews")
+    
+    def _wait_for_run(self, run: Dict) -> Dict:
+        """Block until an actor run finishes and return its final state, raising unless it succeeded"""
+        finished_run = self.client.run(run["id"]).wait_for_finish()
+        status = finished_run.get("status") if finished_run else None
+        if status != "SUCCEEDED":
+            raise RuntimeError(f"Apify run {run['id']} finished with status {status}")
+        return finished_run
     
     def _process_google_reviews(self, raw_reviews: List[Dict], source_url: str) -> List[Dict]:
         """Process Google reviews - flatten raw data and add minimal metadata"""
-        processed = []
-        
-        for review in raw_reviews:
-            try:
-                # Start with the raw review data (flattened)
-                processed_review = review.copy()
-                
-                # Add our metadata fields
-                processed_review.update({
-                    "review_id": review.get("reviewId"),  # Use the actual reviewId from raw data
-                    "rating": review.get("stars"),  # Use stars field from raw data
-                    "source_url": source_url,
-                    # Don't add establishment_id, platform, scraped_at here - DB manager will add them
-                })
-                
-                processed.append(processed_review)
-                
-            except Exception as e:
-                self.logger.warning(f"Error processing Google review: {e}")
-                continue
-        
-        return processed
+        # Raw review data plus our metadata fields, built in one pass per review.
+        # Don't add establishment_id, platform, scraped_at here - DB manager will add them
+        return [
+            {
+                **review,
+                "review_id": review.get("reviewId"),  # Use the actual reviewId from raw data
+                "rating": review.get("stars"),  # Use stars field from raw data
+                "source_url": source_url,
+            }
+            for review in self._valid_reviews(raw_reviews, "Google")
+        ]
     
     def _process_trustpilot_reviews(self, raw_reviews: List[Dict], source_url: str) -> List[Dict]:
         """Process Trustpilot reviews - flatten raw data and add minimal metadata"""
-        processed = []
-        
+        # Raw review data without authorName (as per requirements) plus our metadata fields.
+        # Don't add establishment_id, platform, scraped_at here - DB manager will add them
+        return [
+            {
+                **{key: value for key, value in review.items() if key != "authorName"},
+                "review_id": review.get("reviewUrl", ""),  # Use reviewUrl as review_id
+                "verified": review.get("verificationLevel") == "verified",  # Convert to boolean
+                "source_url": source_url,
+            }
+            for review in self._valid_reviews(raw_reviews, "Trustpilot")
+        ]
+    
+    def _valid_reviews(self, raw_reviews: List[Dict], platform: str) -> Iterator[Dict]:
+        """Yield raw reviews that are dicts, logging and skipping anything else"""
         for review in raw_reviews:
-            try:
-                # Start with the raw review data (flattened)
-                processed_review = review.copy()
-                
-                # Remove authorName if it exists (as per requirements)
-                processed_review.pop('authorName', None)
-                
-                # Add our metadata fields
-                processed_review.update({
-                    "review_id": review.get("reviewUrl", ""),  # Use reviewUrl as review_id
-                    "verified": review.get("verificationLevel") == "verified",  # Convert to boolean
-                    "source_url": source_url,
-                    # Don't add establishment_id, platform, scraped_at here - DB manager will add them
-                })
-                
-                processed.append(processed_review)
-                
-            except Exception as e:
-                self.logger.warning(f"Error processing Trustpilot review: {e}")
-                continue
-        
-        return processed
+            if isinstance(review, dict):
+                yield review
+            else:
+                self.logger.warning(f"Error processing {platform} review: expected dict, got {type(review)}")
@@ -0,0 +1,97 @@
+# tests/test_db_manager.py
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add the engine directory to path, as the engine scripts do for their own imports
+engine_root = Path(__file__).parent.parent / "engine"
+sys.path.append(str(engine_root))
+
+from database.db_manager import DatabaseManager
+
+def _paged(docs):
+    """Mock find() result supporting .skip(n).limit(m) paging over docs"""
+    cursor = MagicMock()
+    cursor.skip.side_effect = lambda skip: MagicMock(
+        limit=lambda limit: docs[skip:skip + limit]
+    )
+    return cursor
+
+class StandardizeReviewsIncrementalTest(unittest.TestCase):
+    def setUp(self):
+        self.existing = {"_id": "existing", "platform": "google", "response_from_owner_text": None}
+        self.google = {"_id": "g1", "platform": "google", "response_from_owner_text": "Vielen Dank!"}
+        self.trustpilot = {
+            "_id": "t1", "platform": "trustpilot", "title": "Super", "review_text": "Sehr gut",
+            "review_language": "de", "response_from_owner_text": None
+        }
+        unified_docs = [self.existing, self.google, self.trustpilot]
+
+        self.db_manager = DatabaseManager()
+        self.db_manager.db = MagicMock()
+
+        unified = self.db_manager.db.unified_reviews
+        unified.estimated_document_count.return_value = len(unified_docs)
+        unified.find.side_effect = lambda *args, **kwargs: _paged(unified_docs)
+
+        ls = self.db_manager.db.ls_unified_reviews
+        ls.estimated_document_count.return_value = 1
+
+        def ls_find(query, projection=None):
+            if "_id" in query:
+                # Confirmation of Bloom filter hits
+                return [{"_id": _id} for _id in query["_id"]["$in"] if _id == "existing"]
+            # Full _id scan that seeds the Bloom filter
+            cursor = MagicMock()
+            cursor.hint.return_value.batch_size.return_value = [{"_id": "existing"}]
+            return cursor
+
+        ls.find.side_effect = ls_find
+
+    def _standardize(self, **kwargs):
+        with patch.object(self.db_manager, "_detect_languages",
+                          side_effect=lambda texts: ["de" if text else None for text in texts]), \
+             patch.object(self.db_manager, "_translate_text", return_value="translated"):
+            return self.db_manager.standardize_reviews_incremental(**kwargs)
+
+    def test_standardizes_only_new_reviews(self):
+        results = self._standardize()
+
+        self.assertEqual(results["standardized"], {"google": 1, "trustpilot": 1})
+        self.assertEqual(
+            results["translations_needed"],
+            {"google_responses": 1, "trustpilot_content": 1, "trustpilot_responses": 0}
+        )
+
+        # One unordered bulk insert holding both new reviews, translated
+        bulk_write = self.db_manager.db.ls_unified_reviews.bulk_write
+        bulk_write.assert_called_once()
+        operations, = bulk_write.call_args.args
+        inserted = {op._doc["_id"]: op._doc for op in operations}
+        self.assertEqual(set(inserted), {"g1", "t1"})
+        self.assertEqual(bulk_write.call_args.kwargs, {"ordered": False})
+
+        self.assertEqual(inserted["g1"]["response_from_owner_text"], "translated")
+        self.assertEqual(inserted["g1"]["response_from_owner_language"], "de")
+        self.assertTrue(inserted["g1"]["has_owner_response"])
+        self.assertEqual(inserted["t1"]["review_text"], "translated")
+        self.assertFalse(inserted["t1"]["has_owner_response"])
+
+    def test_builds_existing_ids_once(self):
+        with patch.object(self.db_manager, "get_existing_ls_unified_review_ids",
+                          wraps=self.db_manager.get_existing_ls_unified_review_ids) as get_existing:
+            self._standardize()
+
+        get_existing.assert_called_once_with()
+
+    def test_filters_by_establishment_ids(self):
+        self._standardize(establishment_ids=["est1"])
+
+        expected_filter = {"establishment_id": {"$in": ["est1"]}}
+        for call in self.db_manager.db.unified_reviews.find.call_args_list:
+            self.assertEqual(call.args[0], expected_filter)
+        self.db_manager.db.unified_reviews.count_documents.assert_called_with(expected_filter)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# tests/test_review_enrichment_processor.py
+import sys
+import unittest
+from pathlib import Path
+
+# Add the engine directory to path, as the engine scripts do for their own imports
+engine_root = Path(__file__).parent.parent / "engine"
+sys.path.append(str(engine_root))
+
+from review_enrichment_processor import ReviewEnrichmentProcessor
+
+def _review(i: int, length: int) -> dict:
+    return {"_id": f"r{i}", "title": "", "review_text": "x" * length}
+
+class PackReviewBatchesTest(unittest.TestCase):
+    def setUp(self):
+        self.processor = ReviewEnrichmentProcessor()
+        self.processor.config = {'processing': {'max_prompt_tokens': 20000}}
+        self.processor.batch_size = 150
+
+    def test_packs_short_reviews_above_old_batch_size(self):
+        reviews = [_review(i, 40) for i in range(100)]
+
+        batches = self.processor._pack_review_batches(reviews)
+
+        self.assertEqual([len(batch) for batch in batches], [100])
+
+    def test_batch_size_caps_reviews_per_batch(self):
+        reviews = [_review(i, 40) for i in range(400)]
+
+        batches = self.processor._pack_review_batches(reviews)
+
+        self.assertEqual([len(batch) for batch in batches], [150, 150, 100])
+
+    def test_token_budget_splits_long_reviews(self):
+        # 4000 characters is ~1020 estimated tokens, so 19 fit in the 20000 token budget
+        reviews = [_review(i, 4000) for i in range(30)]
+
+        batches = self.processor._pack_review_batches(reviews)
+
+        self.assertEqual([len(batch) for batch in batches], [19, 11])
+        self.assertEqual([review["_id"] for batch in batches for review in batch],
+                         [review["_id"] for review in reviews])
+
+if __name__ == "__main__":
+    unittest.main()